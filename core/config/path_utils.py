@@ -5,11 +5,32 @@
 
 import os
 import logging
+from functools import lru_cache
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _load_base_path(db_instance=None) -> str:
+    """读取存档基础路径并缓存，失败时抛出异常（不缓存）"""
+    # 尝试从数据库获取配置管理器
+    if db_instance:
+        config_manager = db_instance.get_config_manager()
+        if config_manager:
+            return config_manager.get_archive_base_path()
+
+    # 如果没有数据库实例，尝试直接创建配置管理器
+    from .config_migrator import ConfigManager
+    config_manager = ConfigManager()
+    return config_manager.get_archive_base_path()
+
+
+def invalidate_base_path_cache():
+    """清除存档基础路径缓存，修改存档路径后调用"""
+    _load_base_path.cache_clear()
+
+
 def get_archive_base_path(db_instance=None) -> str:
     """获取存档基础路径
     
@@ -22,17 +43,7 @@ def get_archive_base_path(db_instance=None) -> str:
         str: 存档基础路径
     """
     try:
-        # 尝试从数据库获取配置管理器
-        if db_instance:
-            config_manager = db_instance.get_config_manager()
-            if config_manager:
-                return config_manager.get_archive_base_path()
-        
-        # 如果没有数据库实例，尝试直接创建配置管理器
-        from .config_migrator import ConfigManager
-        config_manager = ConfigManager()
-        return config_manager.get_archive_base_path()
-        
+        return _load_base_path(db_instance)
     except Exception as e:
         logger.warning(f"获取存档路径失败，使用默认路径: {e}")
         # 返回默认路径
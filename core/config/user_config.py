@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from contextlib import contextmanager
 
+from .path_utils import invalidate_base_path_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -294,6 +296,7 @@ class UserConfigManager:
         
         self._config.set('paths', 'archive_base_path', path)
         self._save_config()
+        invalidate_base_path_cache()
     
     def get_database_path(self) -> str:
         """获取数据库路径"""
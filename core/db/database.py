@@ -13,6 +13,20 @@ from ..base.singleton import SingletonBase
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 连接池配置：LIFO复用最近归还的连接，取出前检测连接可用性
+_ENGINE_OPTIONS = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_pre_ping': True,
+    'pool_use_lifo': True,
+    'pool_recycle': 1800,
+}
+
+
+def _create_engine(db_path: str):
+    """创建带连接池配置的数据库引擎"""
+    return create_engine(f'sqlite:///{db_path}', **_ENGINE_OPTIONS)
+
 class Database(SingletonBase):
     """数据库单例类"""
     
@@ -56,7 +70,7 @@ class Database(SingletonBase):
                 self._config_manager.set_last_used_db(last_used_db)
         
         self._current_db = db_path
-        self.engine = create_engine(f'sqlite:///{self._current_db}')
+        self.engine = _create_engine(self._current_db)
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
         self.init_db()
@@ -100,7 +114,7 @@ class Database(SingletonBase):
 
             # 切换到新数据库
             self._current_db = new_db_path
-            self.engine = create_engine(f'sqlite:///{self._current_db}')
+            self.engine = _create_engine(self._current_db)
             self.Session = sessionmaker(bind=self.engine)
 
             # 更新用户配置中的 last_used_db
@@ -126,7 +140,7 @@ class Database(SingletonBase):
             db_base_path = os.path.join(os.getcwd(), 'databases')
 
         default_db_path = os.path.join(db_base_path, 'default.db')
-        self.engine = create_engine(f'sqlite:///{default_db_path}')
+        self.engine = _create_engine(default_db_path)
         self.Session = sessionmaker(bind=self.engine)
         self._current_db = default_db_path
         logger.info("已恢复到默认数据库")
@@ -2,14 +2,69 @@ import re
 import os
 import concurrent.futures
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
+# 按设备类型缓存的检测器实例，由create_inspector填充
+_INSPECTORS: Dict[str, "DeviceInspector"] = {}
+
+
+def slice_section(content: str, head: str, term: str = '-' * 10) -> Optional[str]:
+    """截取head之后到命令分隔线之前的输出
+
+    分隔线为以term开头的整行，且其后紧跟下一条"命令:"或内容结尾；
+    输出内部的表格分隔线不会截断段落。未找到head时返回None。
+    """
+    start = content.find(head)
+    if start == -1:
+        return None
+    start += len(head)
+    length = len(content)
+    pos = start
+    while True:
+        end = content.find('\n' + term, pos)
+        if end == -1:
+            return content[start:]
+        after = end + 1 + len(term)
+        while after < length and content[after] == '-':
+            after += 1
+        next_pos = after
+        while next_pos < length and content[next_pos].isspace():
+            next_pos += 1
+        if next_pos == length or (content.startswith('命令:', next_pos) and content[next_pos - 1] == '\n'):
+            return content[start:end]
+        pos = after
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    """一次扫描把巡检内容按"命令:"切分为(命令, 段落原文)列表
+
+    段落原文从"命令:"开始，到下一条"命令:"之前结束（包含输出和分隔线），
+    拼接若干段落原文后仍是与原内容格式相同的巡检内容。
+    """
+    sections = []
+    start = content.find('命令:\n')
+    while start != -1:
+        cmd_start = start + len('命令:\n')
+        cmd_end = content.find('\n', cmd_start)
+        if cmd_end == -1:
+            cmd_end = len(content)
+        next_start = content.find('\n命令:\n', cmd_end)
+        end = len(content) if next_start == -1 else next_start + 1
+        sections.append((content[cmd_start:cmd_end].strip(), content[start:end]))
+        start = -1 if next_start == -1 else next_start + 1
+    return sections
+
+
 class DeviceInspector(ABC):
     """设备检测基类"""
 
+    # 各检测项依赖的命令前缀（不区分大小写），键与inspect_all结果的键一致
+    # 未配置的检测项或找不到对应命令时，检测方法仍收到完整内容
+    SECTION_COMMANDS: Dict[str, Tuple[str, ...]] = {}
+
     @staticmethod
     def detect_device_type(content: str) -> str:
         """检测设备类型"""
@@ -104,15 +159,24 @@ class DeviceInspector(ABC):
 
     @staticmethod
     def create_inspector(device_type: str):
-        """创建对应的检测器实例"""
+        """获取对应的检测器实例
+
+        检测器不保存状态，每种设备类型只创建一次，之后复用同一实例。
+        """
+        inspector = _INSPECTORS.get(device_type)
+        if inspector is not None:
+            return inspector
         try:
             if device_type == "huawei":
                 from .huawei import HuaweiInspector
-                return HuaweiInspector()
+                inspector = HuaweiInspector()
             elif device_type == "h3c":
                 from .h3c import H3CInspector
-                return H3CInspector()
-            return None
+                inspector = H3CInspector()
+            else:
+                return None
+            _INSPECTORS[device_type] = inspector
+            return inspector
         except Exception as e:
             logger.error(f"创建检测器实例出错: {e}")
             return None
@@ -286,15 +350,33 @@ class DeviceInspector(ABC):
         """温度检测"""
         pass
 
+    def _section_content(self, sections: List[Tuple[str, str]], key: str, content: str) -> str:
+        """拼接检测项key依赖的命令段落，没有对应段落时返回完整内容"""
+        prefixes = self.SECTION_COMMANDS.get(key)
+        if not prefixes:
+            return content
+        parts = [text for command, text in sections if command.lower().startswith(prefixes)]
+        return ''.join(parts) if parts else content
+
+    def _power_fan_inspect(self, power_content: str, fan_content: str) -> Tuple[Dict, Dict]:
+        """执行电源和风扇检测，子类可重写以共用同一次扫描"""
+        return self.power_inspect(power_content), self.fan_inspect(fan_content)
+
     def inspect_all(self, content: str) -> Dict:
-        """执行所有检测"""
+        """执行所有检测
+
+        内容只切分一次，各检测方法只扫描自己依赖的命令段落。
+        """
+        sections = split_sections(content) if self.SECTION_COMMANDS else []
+        power, fan = self._power_fan_inspect(self._section_content(sections, "power", content),
+                                             self._section_content(sections, "fan", content))
         return {
-            "cpu": self.cpu_inspect(content),
-            "memory": self.mem_inspect(content),
-            "power": self.power_inspect(content),
-            "fan": self.fan_inspect(content),
-            "ntp": self.ntp_inspect(content),
-            "interface_errors": self.int_error_inspect(content),
-            "alarms": self.alarm_inspect(content),
-            "temperature": self.temperature_inspect(content)
+            "cpu": self.cpu_inspect(self._section_content(sections, "cpu", content)),
+            "memory": self.mem_inspect(self._section_content(sections, "memory", content)),
+            "power": power,
+            "fan": fan,
+            "ntp": self.ntp_inspect(self._section_content(sections, "ntp", content)),
+            "interface_errors": self.int_error_inspect(self._section_content(sections, "interface_errors", content)),
+            "alarms": self.alarm_inspect(self._section_content(sections, "alarms", content)),
+            "temperature": self.temperature_inspect(self._section_content(sections, "temperature", content))
         }
\ No newline at end of file
@@ -1,268 +1,310 @@
 import re
-from typing import Dict
-from .base import DeviceInspector
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+from .base import DeviceInspector, slice_section
+
+# 内存输出格式
+_OLD_H3C_MEM = re.compile(r'System Total Memory\(bytes\):\s+(\d+)\s+Total Used Memory\(bytes\):\s+(\d+)\s+Used Rate:\s+(\d+)%', re.DOTALL | re.ASCII)
+_ALT_OLD_H3C_MEM = re.compile(r'System Total Memory\(bytes\):\s+(\d+).*?Total Used Memory\(bytes\):\s+(\d+)', re.DOTALL | re.ASCII)
+_FREERATIO_MEM = re.compile(r'Mem:\s+\d+\s+\d+\s+\d+\s+\d+\s+\d+\s+\d+\s+(\d+\.\d+)%', re.ASCII)
+_OLD_MEM = re.compile(r'Mem:\s+(?:\d+\s+)*(\d+\.\d+)%', re.ASCII)
+
+_CPU_RE = re.compile(r'Slot (\d+) CPU (\d+) CPU usage:\s*'
+                     r'(\d+)% in last 5 seconds\s*'
+                     r'(\d+)% in last 1 minute\s*'
+                     r'(\d+)% in last 5 minutes', re.ASCII)
+
+# 电源输出格式
+_POWER_RE = re.compile(r'^\s*(\d+)\s+(Normal|Absent|Fault|Abnormal|Present)\s+', re.MULTILINE | re.ASCII)
+_ALT_POWER_RE = re.compile(r'Power\s+(\d+):\s+State\s*:\s*(\S+)', re.MULTILINE | re.ASCII)
+_DEVICE_HEADER_RE = re.compile(r'Slot\s+Type\s+State\s+Subslot', re.MULTILINE | re.ASCII)
+_DEVICE_STATE_RE = re.compile(r'\d+\s+\S+\s+(\w+)\s+', re.MULTILINE | re.ASCII)
+_POWER_OK_STATES = frozenset({"Normal", "Present"})
+_DEVICE_OK_STATES = frozenset({"Master", "Normal"})
+
+# 风扇输出格式
+_FAN_RE = re.compile(r'Fan (\d+):\s+\n\s+State\s+:\s+(\S+)', re.MULTILINE | re.ASCII)
+_OLD_FAN_RE = re.compile(r'^.(Fan Frame+\s+\d)\s+.*?\s+State:\s+(\S+)', re.MULTILINE | re.ASCII)
+
+# NTP输出格式
+_NTP_NOT_CONFIGURED_RE = re.compile(r'NTP is not configured|NTP service is disabled', re.IGNORECASE)
+_NTP_CLOCK_RE = re.compile(r' Clock status:\s*(\w+)', re.ASCII)
+_NTP_SERVICE_RE = re.compile(r'Clock\s+status\s*:\s*(\w+)', re.IGNORECASE | re.ASCII)
+_NTP_SYNC_RE = re.compile(r'synchronization\s+status\s*:\s*(\w+)', re.IGNORECASE | re.ASCII)
+_NTP_SECTION_RE = re.compile(r'display ntp status\n输出:|display ntp-service status\n输出:', re.IGNORECASE)
+
+_ERR_HEADER_RE = re.compile(r'Interface\s+.*?Err\s+\(pkts\)', re.ASCII)
+_COUNTER_SECTIONS = (
+    ('display counters inbound interface\n输出:', "入方向"),
+    ('display counters outbound interface\n输出:', "出方向"),
+)
+
+# 告警输出格式
+_UNRECOGNIZED_RE = re.compile(r'% Unrecognized command found at')
+_DEVICE_STATUS_RE = re.compile(r'Device status|Slot\s+Sub\s+Type\s+Online\s+Power\s+Register\s+Status', re.IGNORECASE | re.ASCII)
+_NO_ALARM_RE = re.compile(r'No alarm|No active alarm|No alarm information', re.IGNORECASE)
+_ALARM_KW_RE = re.compile(r'CRITICAL|MAJOR|MINOR|WARNING|Error|Failure|Failed|Alarm|Alert', re.IGNORECASE)
+
+# 温度输出格式：系统温度传感器行，以及风扇、电源温度行
+_TEMP_RE = re.compile(
+    r'(?P<sys>(?P<slot>\d+)\s+(?P<sensor>outflow|hotspot|inflow)\s+\d+\s+(?P<current>\d+)\s+\d+\s+(?P<warning>\d+)\s+(?P<alarm>\d+))'
+    r'|(?P<fan>Fan\s+\d+:\s+(?P<fan_temp>\d+))'
+    r'|(?P<power>Power\s+\d+:\s+(?P<power_temp>\d+))',
+    re.ASCII
+)
+
+
+def _keyword_lines(text: str) -> List[str]:
+    """返回text中包含告警关键词的行（已去除首尾空白）
+
+    沿关键词匹配位置向两侧定位所在行，命中一行后直接跳到下一行继续搜索，
+    不必逐行调用正则。
+    """
+    lines = []
+    match = _ALARM_KW_RE.search(text)
+    while match:
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        line_end = text.find('\n', match.end())
+        if line_end == -1:
+            lines.append(text[line_start:].strip())
+            break
+        lines.append(text[line_start:line_end].strip())
+        match = _ALARM_KW_RE.search(text, line_end + 1)
+    return lines
+
+
+@lru_cache(maxsize=16)
+def _err_column_re(index: int) -> re.Pattern:
+    """构造提取接口名和第index列错包数的行正则
+
+    group(1)为行首第一列（接口名），group(2)为错包数；
+    列之间只匹配行内空白，列数不足的行不会跨行匹配。
+    同型号设备的表头相同，按列索引缓存编译结果。
+    """
+    return re.compile(
+        rf'^[^\S\n]*(\S+)(?:[^\S\n]+\S+){{{index - 1}}}[^\S\n]+(\d+)(?!\S)',
+        re.MULTILINE | re.ASCII
+    )
+
+
+def _counter_errors(section: str) -> Iterator[Tuple[str, int]]:
+    """逐个产出display counters段落中错包数大于0的(接口名, 错包数)"""
+    # 查找包含"Err"列的表头，提取错包列的索引位置
+    err_column_match = _ERR_HEADER_RE.search(section)
+    if not err_column_match:
+        return
+    err_column_index = err_column_match.group(0).split().index("Err")
+
+    # 处理每一行接口数据，错包列不是整数的行不会匹配
+    for row in _err_column_re(err_column_index).finditer(section):
+        # 跳过表头和分隔线，接口名本身可以包含连字符（如Bridge-Aggregation1）
+        interface, err_count = row.groups()
+        if interface.startswith('-') or interface.startswith('Interface'):
+            continue
+
+        err_count = int(err_count)
+        if err_count > 0:
+            yield interface, err_count
+
 
 class H3CInspector(DeviceInspector):
     """H3C设备检测类"""
 
+    SECTION_COMMANDS = {
+        "cpu": ("display cpu",),
+        "memory": ("display memory",),
+        "power": ("display power", "display device"),
+        "fan": ("display fan", "display device"),
+        "ntp": ("display ntp",),
+        "interface_errors": ("display counters",),
+        "alarms": ("display alarm", "display logbuffer", "display device"),
+        "temperature": ("display environment",),
+    }
+
     def cpu_inspect(self, content: str) -> Dict:
-        cpu_abnormal = {}
-        if not re.search("display cpu", content):
+        cpu_abnormal = None
+        if "display cpu" not in content:
             return {"status": "error", "message": "请检查是否运行display cpu命令"}
 
-        pattern = re.compile(r'Slot (\d+) CPU (\d+) CPU usage:\s*'
-                           r'(\d+)% in last 5 seconds\s*'
-                           r'(\d+)% in last 1 minute\s*'
-                           r'(\d+)% in last 5 minutes')
-        matches = pattern.finditer(content)
-        for match in matches:
-            if match and match.groups():
-                cpu_name = f"Slot {match.group(1)} CPU {match.group(2)}"
-                if int(match.group(3)) >= 80 or int(match.group(4)) >= 80 or int(match.group(5)) >= 80:
-                    current_usage = f"5秒钟:{match.group(3)}%; 1分钟:{match.group(4)}%; 5分钟:{match.group(5)}%;"
-                    cpu_abnormal[cpu_name] = current_usage
+        for match in _CPU_RE.finditer(content):
+            slot, cpu, usage_5s, usage_1m, usage_5m = match.groups()
+            usage_5s, usage_1m, usage_5m = int(usage_5s), int(usage_1m), int(usage_5m)
+            if max(usage_5s, usage_1m, usage_5m) >= 80:
+                cpu_name = f"Slot {slot} CPU {cpu}"
+                current_usage = f"5秒钟:{usage_5s}%; 1分钟:{usage_1m}%; 5分钟:{usage_5m}%;"
+                if cpu_abnormal is None:
+                    cpu_abnormal = {}
+                cpu_abnormal[cpu_name] = current_usage
 
         if not cpu_abnormal:
             return {"status": "normal", "message": "CPU状态:正常"}
         return {"status": "abnormal", "message": "CPU状态:异常", "details": cpu_abnormal}
 
     def mem_inspect(self, content: str) -> Dict:
-        if not re.search("display memory", content):
+        if "display memory" not in content:
             return {"status": "error", "message": "请检查是否运行display memory命令"}
 
-        # 尝试匹配老H3C格式 (System Total Memory/Used Rate格式)
-        old_h3c_pattern = re.compile(r'System Total Memory\(bytes\):\s+(\d+)\s+Total Used Memory\(bytes\):\s+(\d+)\s+Used Rate:\s+(\d+)%', re.DOTALL)
-        old_h3c_match = old_h3c_pattern.search(content)
+        # 先用字面量判断输出格式，只运行对应格式的正则
+        if "System Total Memory" in content:
+            # 尝试匹配老H3C格式 (System Total Memory/Used Rate格式)
+            if "Used Rate:" in content:
+                old_h3c_match = _OLD_H3C_MEM.search(content)
+                if old_h3c_match:
+                    # 直接从输出中获取使用率
+                    usage_ratio = float(old_h3c_match.group(3))
+
+                    if usage_ratio >= 80.0:
+                        return {"status": "abnormal", "message": f"内存状态:异常, 内存使用率:{usage_ratio:.1f}%"}
+                    return {"status": "normal", "message": f"内存状态:正常, 内存使用率:{usage_ratio:.1f}%"}
+
+            # 尝试匹配另一种老H3C格式
+            alt_old_h3c_match = _ALT_OLD_H3C_MEM.search(content)
 
-        if old_h3c_match:
-            # 直接从输出中获取使用率
-            usage_ratio = float(old_h3c_match.group(3))
+            if alt_old_h3c_match:
+                # 计算使用率
+                total_memory = float(alt_old_h3c_match.group(1))
+                used_memory = float(alt_old_h3c_match.group(2))
 
-            if usage_ratio >= 80.0:
-                return {"status": "abnormal", "message": f"内存状态:异常, 内存使用率:{usage_ratio:.1f}%"}
-            return {"status": "normal", "message": f"内存状态:正常, 内存使用率:{usage_ratio:.1f}%"}
+                if total_memory > 0:
+                    usage_ratio = (used_memory / total_memory) * 100
 
-        # 尝试匹配另一种老H3C格式
-        alt_old_h3c_pattern = re.compile(r'System Total Memory\(bytes\):\s+(\d+).*?Total Used Memory\(bytes\):\s+(\d+)', re.DOTALL)
-        alt_old_h3c_match = alt_old_h3c_pattern.search(content)
+                    if usage_ratio >= 80.0:
+                        return {"status": "abnormal", "message": f"内存状态:异常, 内存使用率:{usage_ratio:.1f}%"}
+                    return {"status": "normal", "message": f"内存状态:正常, 内存使用率:{usage_ratio:.1f}%"}
 
-        if alt_old_h3c_match:
-            # 计算使用率
-            total_memory = float(alt_old_h3c_match.group(1))
-            used_memory = float(alt_old_h3c_match.group(2))
+        if "Mem:" in content:
+            # 尝试匹配FreeRatio格式 (新H3C格式)
+            freeratio_match = _FREERATIO_MEM.search(content)
 
-            if total_memory > 0:
-                usage_ratio = (used_memory / total_memory) * 100
+            if freeratio_match:
+                free_ratio = float(freeratio_match.group(1))
+                usage_ratio = 100.0 - free_ratio
 
                 if usage_ratio >= 80.0:
                     return {"status": "abnormal", "message": f"内存状态:异常, 内存使用率:{usage_ratio:.1f}%"}
                 return {"status": "normal", "message": f"内存状态:正常, 内存使用率:{usage_ratio:.1f}%"}
 
-        # 尝试匹配FreeRatio格式 (新H3C格式)
-        freeratio_pattern = re.compile(r'Mem:\s+\d+\s+\d+\s+\d+\s+\d+\s+\d+\s+\d+\s+(\d+\.\d+)%')
-        freeratio_match = freeratio_pattern.search(content)
-
-        if freeratio_match:
-            free_ratio = float(freeratio_match.group(1))
-            usage_ratio = 100.0 - free_ratio
-
-            if usage_ratio >= 80.0:
-                return {"status": "abnormal", "message": f"内存状态:异常, 内存使用率:{usage_ratio:.1f}%"}
-            return {"status": "normal", "message": f"内存状态:正常, 内存使用率:{usage_ratio:.1f}%"}
-
-        # 尝试匹配其他旧格式
-        old_pattern = re.compile(r'Mem:\s+(?:\d+\s+)*(\d+\.\d+)%')
-        old_matches = old_pattern.findall(content)
-
-        if old_matches:
-            percentages = [float(match) for match in old_matches]
-            adjusted_values = [100 - percentage for percentage in percentages]
-            max_usage = max(adjusted_values)
+            # 尝试匹配其他旧格式
+            max_usage = max((100.0 - float(free) for free in _OLD_MEM.findall(content)), default=None)
 
-            if max_usage >= 80.0:
-                return {"status": "abnormal", "message": f"内存状态:异常, 内存使用率:{max_usage:.1f}%"}
-            return {"status": "normal", "message": f"内存状态:正常, 内存使用率:{max_usage:.1f}%"}
+            if max_usage is not None:
+                if max_usage >= 80.0:
+                    return {"status": "abnormal", "message": f"内存状态:异常, 内存使用率:{max_usage:.1f}%"}
+                return {"status": "normal", "message": f"内存状态:正常, 内存使用率:{max_usage:.1f}%"}
 
         return {"status": "error", "message": "无法获取内存使用率"}
 
     def power_inspect(self, content: str) -> Dict:
-        power_abnormal = {}
-        if not re.search(r"display power|display device", content, re.IGNORECASE):
+        power_abnormal = None
+        lc_content = content.lower()
+        if "display power" not in lc_content and "display device" not in lc_content:
             return {"status": "error", "message": "请检查是否运行display power或display device命令"}
 
         # 匹配H3C电源输出格式 - 更精确的模式匹配
         # 匹配 PowerID State Mode Current(A) Voltage(V) Power(W) 格式
-        pattern = re.compile(r'^\s*(\d+)\s+(Normal|Absent|Fault|Abnormal|Present)\s+', re.MULTILINE)
-        matches = pattern.findall(content)
-
-        # 检查是否找到电源状态信息
-        if matches:
-            for match in matches:
-                if match and len(match) >= 2:
-                    if match[1] != "Normal" and match[1] != "Present":
-                        power_name = f"电源{match[0]}"
-                        power_abnormal[power_name] = match[1]
-        else:
-            # 如果没有找到标准格式，尝试其他格式
-            alt_pattern = re.compile(r'Power\s+(\d+):\s+State\s*:\s*(\S+)', re.MULTILINE)
-            alt_matches = alt_pattern.findall(content)
-
-            for match in alt_matches:
-                if match and len(match) >= 2:
-                    if match[1] != "Normal" and match[1] != "Present":
-                        power_name = f"电源{match[0]}"
-                        power_abnormal[power_name] = match[1]
+        matches = _POWER_RE.findall(content)
+
+        # 没有找到标准格式时尝试其他格式，两个分组的findall结果恒为二元组，直接解包
+        for power_id, state in matches or _ALT_POWER_RE.findall(content):
+            if state not in _POWER_OK_STATES:
+                if power_abnormal is None:
+                    power_abnormal = {}
+                power_abnormal[f"电源{power_id}"] = state
 
         # 检查display device输出中的电源状态
         if not power_abnormal and not matches:
             # 如果是S5560X等型号，通常只显示设备状态而不单独显示电源状态
-            device_pattern = re.compile(r'Slot\s+Type\s+State\s+Subslot', re.MULTILINE)
-            if device_pattern.search(content):
-                # 检查设备状态是否正常
-                device_state_pattern = re.compile(r'(\d+)\s+(\S+)\s+(\w+)\s+', re.MULTILINE)
-                device_matches = device_state_pattern.findall(content)
-                for match in device_matches:
-                    if match and len(match) >= 3:
-                        # 如果设备状态正常，则认为电源也正常
-                        if match[2] == "Master" or match[2] == "Normal":
-                            return {"status": "normal", "message": "电源状态:正常"}
+            if _DEVICE_HEADER_RE.search(content):
+                # 检查设备状态是否正常，只捕获状态列
+                for state in _DEVICE_STATE_RE.findall(content):
+                    # 如果设备状态正常，则认为电源也正常
+                    if state in _DEVICE_OK_STATES:
+                        return {"status": "normal", "message": "电源状态:正常"}
 
         if not power_abnormal:
             return {"status": "normal", "message": "电源状态:正常"}
         return {"status": "abnormal", "message": "电源状态:异常", "details": power_abnormal}
 
     def fan_inspect(self, content: str) -> Dict:
-        fan_abnormal = {}
-        if not re.search(r"display fan|display device", content, re.IGNORECASE):
+        fan_abnormal = None
+        lc_content = content.lower()
+        if "display fan" not in lc_content and "display device" not in lc_content:
             return {"status": "error", "message": "请检查是否运行display device命令"}
 
         # 匹配 "Fan X:" 和 "State    : XXX" 格式
-        pattern = re.compile(r'Fan (\d+):\s+\n\s+State\s+:\s+(\S+)', re.MULTILINE)
-        matches = pattern.finditer(content)
-
-        for match in matches:
-            if match and match.groups():
-                fan_id = match.group(1)
-                state = match.group(2)
+        found = False
+
+        for match in _FAN_RE.finditer(content):
+            found = True
+            fan_id, state = match.groups()
+            if state != "Normal":
+                if fan_abnormal is None:
+                    fan_abnormal = {}
+                fan_abnormal[f"Fan {fan_id}"] = state
+
+        # 如果没有匹配到，尝试旧格式（finditer 返回的迭代器恒为真，需用标志位判断）
+        if not found:
+            for fan_name, state in _OLD_FAN_RE.findall(content):
                 if state != "Normal":
-                    fan_abnormal[f"Fan {fan_id}"] = state
-
-        # 如果没有匹配到，尝试旧格式
-        if not matches:
-            old_pattern = re.compile(r'^.(Fan Frame+\s+\d)\s+.*?\s+State:\s+(\S+)', re.MULTILINE)
-            old_matches = old_pattern.findall(content)
-            for match in old_matches:
-                if match and len(match) >= 2:
-                    if match[1] != "Normal":
-                        fan_abnormal[match[0]] = match[1]
+                    if fan_abnormal is None:
+                        fan_abnormal = {}
+                    fan_abnormal[fan_name] = state
 
         if not fan_abnormal:
             return {"status": "normal", "message": "风扇状态:正常"}
         return {"status": "abnormal", "message": "风扇状态:异常", "details": fan_abnormal}
 
     def ntp_inspect(self, content: str) -> Dict:
-        if not re.search(r"display ntp status", content, re.IGNORECASE):
+        if "display ntp status" not in content.lower():
             return {"status": "error", "message": "请检查是否运行display ntp status命令"}
 
         # 检查是否配置了NTP
-        not_configured = re.search(r'NTP is not configured|NTP service is disabled', content, re.IGNORECASE)
+        not_configured = _NTP_NOT_CONFIGURED_RE.search(content)
         if not_configured:
             return {"status": "warning", "message": "NTP未配置"}
 
         # 检查NTP状态 - 标准格式
-        ntp_match = re.search(r' Clock status:\s*(\w+)', content)
+        ntp_match = _NTP_CLOCK_RE.search(content)
         if ntp_match and ntp_match.group(1).lower() == "synchronized":
             return {"status": "normal", "message": "NTP状态:正常"}
 
         # 检查NTP状态 - H3C ntp-service格式
-        ntp_service_match = re.search(r'Clock\s+status\s*:\s*(\w+)', content, re.IGNORECASE)
+        ntp_service_match = _NTP_SERVICE_RE.search(content)
         if ntp_service_match and ntp_service_match.group(1).lower() == "synchronized":
             return {"status": "normal", "message": "NTP状态:正常"}
 
         # 检查NTP状态 - 另一种H3C格式
-        alt_ntp_match = re.search(r'synchronization\s+status\s*:\s*(\w+)', content, re.IGNORECASE)
+        alt_ntp_match = _NTP_SYNC_RE.search(content)
         if alt_ntp_match and alt_ntp_match.group(1).lower() in ["synchronized", "synced"]:
             return {"status": "normal", "message": "NTP状态:正常"}
 
         # 如果没有找到状态信息，但有NTP相关输出
-        if re.search(r'display ntp status\n输出:|display ntp-service status\n输出:', content, re.IGNORECASE):
+        if _NTP_SECTION_RE.search(content):
             return {"status": "abnormal", "message": "NTP状态:异常，未同步"}
 
         return {"status": "abnormal", "message": f"NTP状态:异常，当前状态:{ntp_match.group(1) if ntp_match else '未知'}"}
 
     def int_error_inspect(self, content: str) -> Dict:
-        int_error_abnormal = {}
-        if not re.search(r"display counters", content, re.IGNORECASE):
+        int_error_abnormal = None
+        if "display counters" not in content.lower():
             return {"status": "error", "message": "请检查是否运行display counters inbound interface和display counters outbound interface命令"}
 
-        # 查找错包数据
-        # 首先检查inbound
-        inbound_section = re.search(r'display counters inbound interface\n输出:.*?(?=--------------------------------------------------)', content, re.DOTALL)
-        if inbound_section:
-            inbound_content = inbound_section.group(0)
-
-            # 查找包含"Err"列的行
-            err_column_match = re.search(r'Interface\s+.*?Err\s+\(pkts\)', inbound_content)
-            if err_column_match:
-                # 提取所有接口行及其错包数
-                # 匹配格式: 接口名 + 若干空格和数字 + 最后一列的错包数
-                # 我们不再使用正则表达式匹配，而是直接解析每一行
-
-                # 提取错包列的索引位置
-                header_line = re.search(r'Interface\s+.*?Err\s+\(pkts\)', inbound_content).group(0)
-                err_column_index = header_line.split().index("Err")
-
-                # 处理每一行接口数据
-                for line in inbound_content.split('\n'):
-                    # 跳过表头和空行
-                    if not line.strip() or 'Interface' in line or '-' in line:
-                        continue
-
-                    parts = line.split()
-                    if len(parts) > err_column_index:
-                        interface = parts[0]
-                        try:
-                            err_count = int(parts[err_column_index])
-                            if err_count > 0:
-                                interface_name = f"接口:{interface}"
-                                error_num = f"入方向错包数:{err_count}"
-                                int_error_abnormal[interface_name] = error_num
-                        except (ValueError, IndexError):
-                            # 忽略无法解析的行
-                            pass
-
-        # 然后检查outbound
-        outbound_section = re.search(r'display counters outbound interface\n输出:.*?(?=--------------------------------------------------)', content, re.DOTALL)
-        if outbound_section:
-            outbound_content = outbound_section.group(0)
-
-            # 查找包含"Err"列的行
-            err_column_match = re.search(r'Interface\s+.*?Err\s+\(pkts\)', outbound_content)
-            if err_column_match:
-                # 提取错包列的索引位置
-                header_line = re.search(r'Interface\s+.*?Err\s+\(pkts\)', outbound_content).group(0)
-                err_column_index = header_line.split().index("Err")
-
-                # 处理每一行接口数据
-                for line in outbound_content.split('\n'):
-                    # 跳过表头和空行
-                    if not line.strip() or 'Interface' in line or '-' in line:
-                        continue
-
-                    parts = line.split()
-                    if len(parts) > err_column_index:
-                        interface = parts[0]
-                        try:
-                            err_count = int(parts[err_column_index])
-                            if err_count > 0:
-                                interface_name = f"接口:{interface}"
-                                if interface_name in int_error_abnormal:
-                                    int_error_abnormal[interface_name] += f", 出方向错包数:{err_count}"
-                                else:
-                                    int_error_abnormal[interface_name] = f"出方向错包数:{err_count}"
-                        except (ValueError, IndexError):
-                            # 忽略无法解析的行
-                            pass
+        # 查找错包数据，先检查inbound再检查outbound
+        for head, direction in _COUNTER_SECTIONS:
+            section = slice_section(content, head)
+            if section is None:
+                continue
+
+            for interface, err_count in _counter_errors(section):
+                interface_name = f"接口:{interface}"
+                error_num = f"{direction}错包数:{err_count}"
+                if int_error_abnormal is None:
+                    int_error_abnormal = {}
+                # 出方向错包追加到同一接口的入方向记录之后
+                if direction == "出方向" and interface_name in int_error_abnormal:
+                    int_error_abnormal[interface_name] += f", {error_num}"
+                else:
+                    int_error_abnormal[interface_name] = error_num
 
         # 我们不再使用display interface brief命令检测接口状态
         # 只使用display counters命令检测错包
@@ -273,125 +315,109 @@ class H3CInspector(DeviceInspector):
 
     def alarm_inspect(self, content: str) -> Dict:
         # 检查是否执行了告警命令或日志命令
-        if not re.search(r"display alarm|display logbuffer", content, re.IGNORECASE):
+        lc_content = content.lower()
+        if "display alarm" not in lc_content and "display logbuffer" not in lc_content:
             return {"status": "error", "message": "请检查是否运行display logbuffer命令"}
 
         # 检查命令是否被识别
-        unrecognized = re.search(r'% Unrecognized command found at', content)
+        unrecognized = _UNRECOGNIZED_RE.search(content)
         if unrecognized:
             # 尝试查找日志信息
-            logbuffer_pattern = r'命令:\s*display logbuffer\s*\n输出:\s*\n(.*?)(?=\n-{10,}\s*\n命令:|\n-{10,}\s*$|$)'
-            logbuffer_match = re.search(logbuffer_pattern, content, re.DOTALL)
-
-            if logbuffer_match:
-                log_output = logbuffer_match.group(1).strip()
+            log_output = slice_section(content, '命令:\ndisplay logbuffer\n输出:\n')
 
-                # 检查日志中是否有严重错误或告警
-                error_keywords = ['CRITICAL', 'MAJOR', 'MINOR', 'WARNING', 'Error', 'Failure', 'Failed', 'Alarm', 'Alert']
-                has_error = any(keyword.lower() in log_output.lower() for keyword in error_keywords)
+            if log_output is not None:
+                log_output = log_output.strip()
 
-                if has_error:
-                    # 提取包含错误关键词的行
-                    error_lines = []
-                    for line in log_output.split('\n'):
-                        if any(keyword.lower() in line.lower() for keyword in error_keywords):
-                            error_lines.append(line.strip())
-
-                    if error_lines:
-                        return {"status": "abnormal", "message": "日志中发现错误", "details": '\n'.join(error_lines)}
+                # 检查日志中是否有严重错误或告警，并提取包含错误关键词的行
+                error_lines = _keyword_lines(log_output)
+                if error_lines:
+                    return {"status": "abnormal", "message": "日志中发现错误", "details": '\n'.join(error_lines)}
 
                 return {"status": "normal", "message": "日志中未发现严重错误"}
 
             return {"status": "warning", "message": "设备不支持display alarm命令，无法检测告警状态"}
 
         # 检查是否包含设备状态信息（通常来自display device命令）
-        is_device_status = bool(re.search(r'Device status|Slot\s+Sub\s+Type\s+Online\s+Power\s+Register\s+Status', content, re.IGNORECASE))
+        is_device_status = bool(_DEVICE_STATUS_RE.search(content))
         if is_device_status:
             return {"status": "normal", "message": "无活动告警"}
 
         # 提取告警命令输出部分
-        alarm_section_pattern = r'命令:\s*display alarm\s*\n输出:\s*\n(.*?)(?=\n-{10,}\s*\n命令:|\n-{10,}\s*$|$)'
-        alarm_section_match = re.search(alarm_section_pattern, content, re.DOTALL)
+        alarm_output = slice_section(content, '命令:\ndisplay alarm\n输出:\n')
 
-        if alarm_section_match:
-            alarm_output = alarm_section_match.group(1).strip()
+        if alarm_output is not None:
+            alarm_output = alarm_output.strip()
 
             # 如果输出为空或只有空白字符，表示没有告警
             if not alarm_output:
                 return {"status": "normal", "message": "无活动告警"}
 
             # 检查是否包含"No alarm"或类似信息
-            if re.search(r'No alarm|No active alarm|No alarm information', alarm_output, re.IGNORECASE):
+            if _NO_ALARM_RE.search(alarm_output):
                 return {"status": "normal", "message": "无活动告警"}
 
             # 检查是否包含告警关键词
-            alarm_keywords = ['CRITICAL', 'MAJOR', 'MINOR', 'WARNING', 'Error', 'Failure', 'Failed', 'Alarm', 'Alert']
-            has_alarm_keyword = any(keyword.lower() in alarm_output.lower() for keyword in alarm_keywords)
-
-            if has_alarm_keyword:
+            if _ALARM_KW_RE.search(alarm_output):
                 return {"status": "abnormal", "message": "有活动告警", "details": alarm_output}
 
         # 检查日志缓冲区
-        logbuffer_pattern = r'命令:\s*display logbuffer\s*\n输出:\s*\n(.*?)(?=\n-{10,}\s*\n命令:|\n-{10,}\s*$|$)'
-        logbuffer_match = re.search(logbuffer_pattern, content, re.DOTALL)
-
-        if logbuffer_match:
-            log_output = logbuffer_match.group(1).strip()
-
-            # 检查日志中是否有严重错误或告警
-            error_keywords = ['CRITICAL', 'MAJOR', 'MINOR', 'WARNING', 'Error', 'Failure', 'Failed', 'Alarm', 'Alert']
-            has_error = any(keyword.lower() in log_output.lower() for keyword in error_keywords)
-
-            if has_error:
-                # 提取包含错误关键词的行
-                error_lines = []
-                for line in log_output.split('\n'):
-                    if any(keyword.lower() in line.lower() for keyword in error_keywords):
-                        error_lines.append(line.strip())
-
-                if error_lines:
-                    return {"status": "abnormal", "message": "日志中发现错误", "details": '\n'.join(error_lines)}
-
-        # 正常情况下的告警检测 - 尝试匹配表格结构
-        alarm_table = re.search(
-            r'(?<=display alarm\n输出:\n)\n*(-+)\n(.*?)\n(-+)\n(.*?)\n(-+)(\n=+)?',
-            content,
-            re.DOTALL
-        )
-
-        if alarm_table and alarm_table.group(0):
-            # 检查表格内容是否为空或只有表头
-            table_content = alarm_table.group(0).strip()
-            table_lines = [line.strip() for line in table_content.split('\n') if line.strip() and not line.strip().startswith('-')]
-
-            if len(table_lines) > 2:  # 有表头，所以大于2行表示有告警
-                return {"status": "abnormal", "message": "有活动告警", "details": table_content}
+        log_output = slice_section(content, '命令:\ndisplay logbuffer\n输出:\n')
+
+        if log_output is not None:
+            log_output = log_output.strip()
+
+            # 检查日志中是否有严重错误或告警，并提取包含错误关键词的行
+            error_lines = _keyword_lines(log_output)
+            if error_lines:
+                return {"status": "abnormal", "message": "日志中发现错误", "details": '\n'.join(error_lines)}
+
+        # 正常情况下的告警检测 - 按行解析告警输出中的表格结构
+        # 表格格式: 分隔线 / 表头 / 分隔线 / 告警行 / 分隔线
+        if alarm_output and alarm_output.startswith('-'):
+            table_lines = []
+            row_count = 0
+            ruler_count = 0
+            for line in alarm_output.split('\n'):
+                table_lines.append(line)
+                stripped = line.strip()
+                # 只有整行都是'-'才算分隔线，以'-'开头的告警行仍计入行数
+                if set(stripped) == {'-'}:
+                    ruler_count += 1
+                    if ruler_count == 3:
+                        break
+                elif stripped:
+                    row_count += 1
+
+            # 有表头，所以大于2行表示有告警
+            if ruler_count == 3 and row_count > 2:
+                return {"status": "abnormal", "message": "有活动告警", "details": '\n'.join(table_lines).strip()}
 
         return {"status": "normal", "message": "无活动告警"}
 
     def temperature_inspect(self, content: str) -> Dict:
         """检查设备温度状态"""
         # 首先检查命令是否执行
-        if not re.search(r"display environment", content, re.IGNORECASE):
+        lc_content = content.lower()
+        if "display environment" not in lc_content:
             return {"status": "warning", "message": "温度状态:未知，设备可能不支持display environment命令"}
 
         # 检查是否有温度信息输出
-        if not re.search(r"temperature|hotspot|sensor", content, re.IGNORECASE):
+        if "temperature" not in lc_content and "hotspot" not in lc_content and "sensor" not in lc_content:
             return {"status": "warning", "message": "温度状态:未知，未找到温度信息"}
 
         temp_abnormal = {}
+        max_temp = 0
 
-        # 匹配标准格式: System temperature information
-        pattern = re.compile(r'(\d+)\s+(outflow|hotspot|inflow)\s+\d+\s+(\d+)\s+\d+\s+(\d+)\s+(\d+)')
-        matches = list(pattern.finditer(content))
-
-        for match in matches:
-            if match and len(match.groups()) >= 5:
-                slot = match.group(1)
-                sensor_type = match.group(2)
-                current_temp = int(match.group(3))
-                warning_temp = int(match.group(4))
-                alarm_temp = int(match.group(5))
+        # 一次扫描同时处理系统温度、风扇温度和电源温度
+        # 风扇和电源温度只用于显示最高温度，依赖设备自身的告警机制
+        for match in _TEMP_RE.finditer(content):
+            kind = match.lastgroup
+            if kind == "sys":
+                slot, sensor_type, current_temp, warning_temp, alarm_temp = match.group(
+                    "slot", "sensor", "current", "warning", "alarm")
+                current_temp = int(current_temp)
+                warning_temp = int(warning_temp)
+                alarm_temp = int(alarm_temp)
 
                 # 直接比较当前温度与警告和告警阈值
                 if current_temp >= alarm_temp:
@@ -400,49 +426,14 @@ class H3CInspector(DeviceInspector):
                 elif current_temp >= warning_temp:
                     sensor_name = f"Slot {slot} {sensor_type}"
                     temp_abnormal[sensor_name] = f"当前温度:{current_temp}°C, 已达警告阈值:{warning_temp}°C"
-
-        # 我们不再单独检测风扇和电源温度，而是依赖设备自身的告警机制
-        # 只收集风扇和电源温度信息用于显示最高温度
-        fan_pattern = re.compile(r'Fan\s+(\d+):\s+(\d+)')
-        fan_matches = fan_pattern.finditer(content)
-
-        fan_temps = []
-        for match in fan_matches:
-            if match and len(match.groups()) >= 2:
-                try:
-                    fan_temp = int(match.group(2))
-                    fan_temps.append(fan_temp)
-                except (ValueError, TypeError):
-                    pass
-
-        # 收集电源温度信息
-        power_pattern = re.compile(r'Power\s+(\d+):\s+(\d+)')
-        power_matches = power_pattern.finditer(content)
-
-        power_temps = []
-        for match in power_matches:
-            if match and len(match.groups()) >= 2:
-                try:
-                    power_temp = int(match.group(2))
-                    power_temps.append(power_temp)
-                except (ValueError, TypeError):
-                    pass
-
-        # 获取最高温度值用于显示
-        max_temp = 0
-        all_temps = []
-
-        # 从系统温度中提取
-        for match in matches:
-            if match and len(match.groups()) >= 3:
-                all_temps.append(int(match.group(3)))
-
-        # 添加风扇和电源温度
-        all_temps.extend(fan_temps)
-        all_temps.extend(power_temps)
-
-        if all_temps:
-            max_temp = max(all_temps)
+            elif kind == "fan":
+                current_temp = int(match.group("fan_temp"))
+            else:
+                current_temp = int(match.group("power_temp"))
+
+            # 获取最高温度值用于显示
+            if current_temp > max_temp:
+                max_temp = current_temp
 
         if not temp_abnormal:
             return {"status": "normal", "message": f"温度状态:正常，最高温度:{max_temp}°C"}
@@ -1,6 +1,7 @@
 import logging
 from math import isnan
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Tuple
 
 from nornir.core.inventory import (
     Inventory,
@@ -11,66 +12,68 @@ from nornir.core.inventory import (
 
 logger = logging.getLogger(__name__)
 
+# 数据库中没有默认设置或读取失败时使用的安全默认值（只读模板，使用时复制）
+_SAFE_CONNECTION_OPTIONS = MappingProxyType({
+    "timeout": 60,
+    "global_delay_factor": 2.0,
+    "fast_cli": False,
+    "read_timeout_override": 30
+})
+
+# 不放入主机 data 的字段，这些字段由 Host 的同名参数单独处理
+_NO_DATA_FIELDS = frozenset({'name', 'hostname', 'port', 'username', 'password', 'platform'})
+
 def _empty(x: Any) -> bool:
     """检查 x 是否为 NaN 或 None/空字符串"""
     return x is None or (isinstance(x, float) and isnan(x)) or x == ""
 
+# ConnectionOptions 接受的参数，未提供的参数保持其默认值 None
+_CONNECTION_KEYS = frozenset({"hostname", "port", "username", "password", "platform", "extras"})
+
 def _get_connection_options(data: Dict[str, Any]) -> Dict[str, ConnectionOptions]:
     """获取连接选项"""
-    cp = {}
-    for cn, c in data.items():
-        cp[cn] = ConnectionOptions(
-            hostname=c.get("hostname"),
-            port=c.get("port"),
-            username=c.get("username"),
-            password=c.get("password"),
-            platform=c.get("platform"),
-            extras=c.get("extras"),
-        )
-    return cp
+    return {
+        cn: ConnectionOptions(**{k: v for k, v in c.items() if k in _CONNECTION_KEYS})
+        for cn, c in data.items()
+    }
 
 def _get_host_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """获取主机数据"""
-    no_data_fields = ['name', 'hostname', 'port', 'username', 'password', 'platform']
     resp_data = {}
-    netmiko_prefix = 'netmiko_'
     for k, v in data.items():
-        if (k not in no_data_fields) and (netmiko_prefix not in k):
+        # netmiko_ 开头的选项由 _get_host_netmiko_options 处理
+        if k not in _NO_DATA_FIELDS and not k.startswith('netmiko_'):
             resp_data[k] = v if not _empty(v) else None
     return resp_data
 
+# 视为 False 的 fast_cli 取值
+_FALSE_VALUES = frozenset({'0', 'false', 'none'})
+
+def _to_fast_cli(value: Any) -> bool:
+    """把 fast_cli 选项转换为布尔值"""
+    return str(value).lower() not in _FALSE_VALUES
+
+# netmiko 选项: 数据字段 -> (extras 中的键, 类型转换函数)
+_NETMIKO_OPTIONS = {
+    'netmiko_timeout': ('timeout', int),
+    'netmiko_global_delay_factor': ('global_delay_factor', float),
+    'netmiko_fast_cli': ('fast_cli', _to_fast_cli),
+    'netmiko_read_timeout': ('read_timeout_override', int),
+}
+
 def _get_host_netmiko_options(data: Dict[str, Any]) -> Dict[str, Any]:
     """获取主机的 netmiko 选项"""
-    netmiko_options = {
-        'netmiko': {
-            'extras': {}
-        }
-    }
-    
-    # 定义需要特殊处理的键
-    option_mappings = {
-        'netmiko_timeout': 'timeout',
-        'netmiko_global_delay_factor': 'global_delay_factor',
-        'netmiko_fast_cli': 'fast_cli',
-        'netmiko_read_timeout': 'read_timeout_override'
-    }
+    # 只查找已知的 netmiko 选项，不遍历整个设备字典，跳过缺失和空值
+    extras = {}
+    for key, (option_key, convert) in _NETMIKO_OPTIONS.items():
+        value = data.get(key)
+        if not _empty(value):
+            extras[option_key] = convert(value)
     
-    # 处理所有 netmiko_ 开头的选项
-    for key, value in data.items():
-        if key in option_mappings:
-            # 跳过空值
-            if _empty(value):
-                continue
-                
-            option_key = option_mappings[key]
-            if option_key in ['timeout', 'read_timeout_override']:
-                netmiko_options['netmiko']['extras'][option_key] = int(value)
-            elif option_key == 'fast_cli':
-                netmiko_options['netmiko']['extras'][option_key] = str(value).lower() not in ['0', 'false', 'none']
-            elif option_key == 'global_delay_factor':
-                netmiko_options['netmiko']['extras'][option_key] = float(value)
-    
-    return _get_connection_options(netmiko_options) if netmiko_options['netmiko']['extras'] else {}
+    # 大多数设备没有设置 netmiko 选项，此时不构建连接选项
+    if not extras:
+        return {}
+    return _get_connection_options({'netmiko': {'extras': extras}})
 
 def _get_host_obj(data: Dict[str, Any]) -> Host:
     """创建主机对象
@@ -90,7 +93,6 @@ def _get_host_obj(data: Dict[str, Any]) -> Host:
     if _empty(data.get('hostname')):
         raise ValueError('主机地址不能为空')
         
-    # 确保名称使用正确的编码
     name = str(data['name'])
     hostname = str(data['hostname'])
     port = int(data['port']) if not _empty(data.get('port')) else 22
@@ -112,12 +114,6 @@ def _get_host_obj(data: Dict[str, Any]) -> Host:
         connection_options=_get_host_netmiko_options(data),
     )
     
-    # 当需要写入文件时，确保使用 utf-8 编码
-    filename = f"{name}_host_data.txt"
-    content = f"Name: {name}\nHostname: {hostname}\nPort: {port}\nUsername: {username}\nPassword: {password}\nPlatform: {platform}\nData: {_get_host_data(data)}"
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
     return host
 
 class FlatDataInventory:
@@ -128,14 +124,19 @@ class FlatDataInventory:
         
         Args:
             data: 设备列表（SQLAlchemy Host 对象列表）
-            connection_options: 连接选项配置（不再使用此参数，仅保留兼容性）
+            connection_options: 连接选项配置，由 NornirManager 传入其缓存的数据库默认值；
+                未传入时从数据库读取
         """
         from core.db.database import Database
         from core.db.models import Defaults
         
         self.data = data or []
         
-        # 始终从数据库获取默认值，忽略传入的connection_options
+        # NornirManager 的默认值缓存在设置变化时失效，可以直接使用
+        if connection_options:
+            self.connection_options = dict(connection_options)
+            return
+        
         try:
             db = Database()
             with db.get_session() as session:
@@ -150,74 +151,58 @@ class FlatDataInventory:
                     logger.info(f"从数据库加载连接选项: {self.connection_options}")
                 else:
                     # 数据库中没有默认值，使用安全的默认值
-                    self.connection_options = {
-                        "timeout": 60,
-                        "global_delay_factor": 2.0,
-                        "fast_cli": False,
-                        "read_timeout_override": 30
-                    }
+                    self.connection_options = dict(_SAFE_CONNECTION_OPTIONS)
                     logger.warning("数据库中未找到默认设置，使用安全默认值")
         except Exception as e:
-            logger.error(f"从数据库加载连接选项时出错: {str(e)}")
+            logger.error("从数据库加载连接选项时出错: %s", e)
             # 发生错误时使用安全的默认值
-            self.connection_options = {
-                "timeout": 60,
-                "global_delay_factor": 2.0,
-                "fast_cli": False,
-                "read_timeout_override": 30
-            }
-
-    def load(self) -> Inventory:
-        """加载清单"""
-        hosts = {}
-        groups = {}
-        defaults = Defaults()
+            self.connection_options = dict(_SAFE_CONNECTION_OPTIONS)
 
+    def _iter_hosts(self, defaults: Defaults) -> Iterator[Tuple[str, Host]]:
+        """逐个产出(设备名, 主机对象)，数据有误的设备记录日志后跳过"""
         for device in self.data:
             try:
-                # 确保所有文本数据使用正确的编码
+                # 数据库返回的字段已是 str，空值统一为 None
                 device_name = device.name
                 hostname = device.hostname
-                platform = device.platform if device.platform else None
-                site = device.site if device.site else None
-                device_type = device.device_type if device.device_type else None
-                device_model = device.device_model if device.device_model else None
-                
-                # 创建连接选项
-                connection_options = {
-                    "netmiko": ConnectionOptions(
-                        platform=platform,
-                        hostname=hostname,
-                        username=device.username,
-                        password=device.password,
-                        port=device.port,
-                        extras={
-                            "timeout": self.connection_options["timeout"],
-                            "global_delay_factor": self.connection_options["global_delay_factor"],
-                            "fast_cli": self.connection_options["fast_cli"],
-                            "read_timeout_override": self.connection_options["read_timeout_override"]
-                        }
-                    )
-                }
+                platform = device.platform or None
+                site = device.site or None
+                device_type = device.device_type or None
+                device_model = device.device_model or None
                 
-                # 创建主机对象
-                hosts[device_name] = Host(
+                # 创建主机对象，netmiko 连接选项从清单的 Defaults 继承
+                host = Host(
                     name=device_name,
                     hostname=hostname,
                     platform=platform,
                     username=device.username,
                     password=device.password,
                     port=device.port,
-                    connection_options=connection_options,
                     data={
                         'site': site,
                         'device_type': device_type,
                         'device_model': device_model
                     },
-                    groups=[]
+                    groups=[],
+                    # 与清单共用同一个 Defaults，不为每台设备各建一个 Defaults
+                    defaults=defaults
                 )
             except Exception as e:
-                logger.error(f"处理设备数据时出错: {str(e)}")
+                logger.error("处理设备数据时出错: %s", e)
                 continue
+            yield device_name, host
 
-        return Inventory(hosts=hosts, groups=groups, defaults=defaults) 
+    def load(self) -> Inventory:
+        """加载清单"""
+        # 所有设备共用的 netmiko 连接参数只构建一次，放在清单的 Defaults 中；
+        # nornir 解析连接参数时，主机名、账号、端口和平台取主机自身的值，extras 取这里的值
+        extras = {
+            "timeout": self.connection_options["timeout"],
+            "global_delay_factor": self.connection_options["global_delay_factor"],
+            "fast_cli": self.connection_options["fast_cli"],
+            "read_timeout_override": self.connection_options["read_timeout_override"]
+        }
+        defaults = Defaults(connection_options={"netmiko": ConnectionOptions(extras=extras)})
+        # 由生成器直接构建主机字典
+        hosts = dict(self._iter_hosts(defaults))
+        return Inventory(hosts=hosts, groups={}, defaults=defaults) 
@@ -1,29 +1,47 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from nornir import InitNornir
 from nornir.core.plugins.inventory import InventoryPluginRegister
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from core.db.database import Database
 from core.db.models import Defaults
 from core.base.singleton import SingletonBase
+from core.event_bus import event_bus
 from .inventory import FlatDataInventory
 import logging
 import sys
-from functools import wraps
-from nornir.core.task import Task, Result
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+
+def _device_key(device) -> Tuple:
+    """设备在清单中的取值，与清单插件一样把空字段统一为None"""
+    return (device.name, device.hostname, device.platform or None,
+            device.username, device.password, device.port,
+            device.site or None, device.device_type or None, device.device_model or None)
+
+
+def _host_key(host) -> Tuple:
+    """清单主机的取值，与 _device_key 一一对应"""
+    data = host.data
+    return (host.name, host.hostname, host.platform,
+            host.username, host.password, host.port,
+            data.get('site'), data.get('device_type'), data.get('device_model'))
+
+
+# 保留的连接空闲超过该时间(秒)或建立超过该时间后自动关闭，避免长期占用设备的VTY线路
+_IDLE_TIMEOUT = 300
+_MAX_AGE = 3600
+
 def encode_task_name(task_function):
-    """装饰器：确保任务名称使用正确的编码"""
-    @wraps(task_function)
-    def wrapper(*args, **kwargs):
-        # 如果第一个参数是 Task 对象
-        if args and isinstance(args[0], Task):
-            task = args[0]
-            # 任务名称和主机名称编码已在数据层面处理
-            # 不需要在这里进行编码转换
-        return task_function(*args, **kwargs)
-    return wrapper
+    """装饰器：保留以兼容已有任务
+
+    任务名称和主机名称本身就是 str，编码已在数据层面处理，
+    直接返回原函数，不再为每次任务调用增加一层包装。
+    """
+    return task_function
 
 class NornirManager(SingletonBase):
     """Nornir管理器基础类"""
@@ -32,31 +50,80 @@ class NornirManager(SingletonBase):
         """初始化Nornir管理器"""
         self.nr = None  # nornir 实例
         self.db = Database()  # 数据库实例
-        
+        self._defaults_cache = None  # 默认连接设置缓存
+        self._nr_key = None  # 保留的nornir实例对应的设备字段和默认设置
+        self._nr_defaults = None  # 当前nornir实例使用的默认设置
+        self._nr_created = 0.0  # 当前nornir实例的创建时间
+        self._nr_last_used = 0.0  # 当前nornir实例最近一次使用完毕的时间
+        self._idle_timer = None  # 到期关闭保留连接的定时器
+        self._keep_lock = threading.Lock()  # 复用与到期关闭互斥
+
+        # 注册自定义清单插件，单例只初始化一次，无需每次init_nornir重复注册
+        InventoryPluginRegister.register("FlatDataInventory", FlatDataInventory)
+
+        # 设置保存或切换数据库后，下次初始化重新读取默认设置
+        event_bus.settings_changed.connect(self.invalidate_defaults)
+        self.db.register_callback(self.invalidate_defaults)
+
+    def invalidate_defaults(self) -> None:
+        """清除默认连接设置缓存"""
+        self._defaults_cache = None
+
     def _get_defaults(self) -> Dict:
-        """获取默认连接设置"""
-        with Session(self.db.engine) as session:
-            defaults = session.query(Defaults).first()
-            if not defaults:
-                defaults = Defaults()
-                session.add(defaults)
-                session.commit()
-            
-            return {
-                "timeout": defaults.timeout,  # 命令执行超时时间
-                "global_delay_factor": defaults.global_delay_factor,  # 全局延迟因子
-                "fast_cli": defaults.fast_cli,  # 快速CLI模式
-                "read_timeout_override": defaults.read_timeout,  # 读取超时时间
-                "num_workers": defaults.num_workers  # 并发工作线程数
+        """获取默认连接设置，结果缓存到设置变化为止"""
+        if self._defaults_cache is None:
+            stmt = select(
+                Defaults.timeout,
+                Defaults.global_delay_factor,
+                Defaults.fast_cli,
+                Defaults.read_timeout,
+                Defaults.num_workers,
+            ).limit(1)
+            # 只读取需要的列，不经过ORM的对象映射
+            with self.db.engine.connect() as conn:
+                row = conn.execute(stmt).first()
+
+            if row is None:
+                # 数据库中没有默认设置时写入一条，提交后属性仍可直接读取
+                with Session(self.db.engine, expire_on_commit=False) as session:
+                    row = Defaults()
+                    session.add(row)
+                    session.commit()
+
+            self._defaults_cache = {
+                "timeout": row.timeout,  # 命令执行超时时间
+                "global_delay_factor": row.global_delay_factor,  # 全局延迟因子
+                "fast_cli": row.fast_cli,  # 快速CLI模式
+                "read_timeout_override": row.read_timeout,  # 读取超时时间
+                "num_workers": row.num_workers  # 并发工作线程数
             }
+        return dict(self._defaults_cache)
         
-    def init_nornir(self, devices: List) -> None:
-        """初始化 nornir"""
+    def init_nornir(self, devices: List, num_workers: Optional[int] = None) -> None:
+        """初始化 nornir
+        
+        Args:
+            devices: 设备列表
+            num_workers: 并发线程数，不指定时使用默认设置；不超过设备数量
+        """
         try:
             defaults = self._get_defaults()
+            # 每台设备一个线程即可，多余的线程不会带来任何并发收益
+            workers = num_workers or defaults['num_workers']
+            if workers:
+                defaults['num_workers'] = max(1, min(workers, len(devices)))
             
-            # 注册自定义清单插件
-            InventoryPluginRegister.register("FlatDataInventory", FlatDataInventory)
+            with self._keep_lock:
+                if self.nr is not None:
+                    # 上次操作保留了连接，设备和设置都没变且未过期时直接复用
+                    if self._reusable() and self._nornir_key(devices, defaults) == self._nr_key:
+                        # 使用期间不再算作空闲，完成后由 close(keep_alive=True) 重新计时
+                        self._cancel_idle_timer()
+                        self._nr_key = None
+                        self.nr.data.reset_failed_hosts()
+                        self._drop_dead_connections()
+                        return self.nr
+                    self.close()
             
             # 初始化 nornir
             self.nr = InitNornir(
@@ -78,30 +145,63 @@ class NornirManager(SingletonBase):
                 }
             )
             
-            # 修改 Nornir 内部任务名称
-            from nornir.core.task import Task  # 修改这里的导入
-            original_task = Task.copy
-            def wrapped_copy(self, *args, **kwargs):
-                result = original_task(self, *args, **kwargs)
-                # 任务名称编码已在数据层面处理，不需要在这里转换
-                return result
-            Task.copy = wrapped_copy
-            
             # 修改关闭连接任务的名称
             self.nr.close_connections_task = "关闭连接"
+            self._nr_defaults = defaults
+            self._nr_created = self._nr_last_used = time.monotonic()
             
             return self.nr
         except Exception as e:
-            logger.error(f"初始化 nornir 失败: {str(e)}")
+            logger.error("初始化 nornir 失败: %s", e)
             return None
     
-    def _wrap_close_connections(self, close_func):
-        """包装 close_connections 函数"""
-        @wraps(close_func)
-        def wrapper(*args, **kwargs):
-            # 主机名编码已在数据层面处理，不需要在这里转换
-            return close_func(*args, **kwargs)
-        return wrapper
+    def _reusable(self) -> bool:
+        """保留的连接是否仍可复用"""
+        if self._nr_key is None:
+            return False
+        now = time.monotonic()
+        return now - self._nr_last_used < _IDLE_TIMEOUT and now - self._nr_created < _MAX_AGE
+    
+    def _cancel_idle_timer(self) -> None:
+        """取消到期关闭保留连接的定时器"""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+    
+    def _close_expired(self, nr) -> None:
+        """定时器到期时关闭仍处于空闲的保留实例"""
+        with self._keep_lock:
+            # 期间已被复用或重新初始化时不处理
+            if self.nr is not nr or self._nr_key is None:
+                return
+            logger.info("保留的连接已空闲或存在过久，自动关闭")
+            self._idle_timer = None
+            self.close()
+    
+    def _drop_dead_connections(self) -> None:
+        """关闭已被设备断开的保留会话，任务运行时会重新建立连接"""
+        for host in self.nr.inventory.hosts.values():
+            conn = host.connections.get("netmiko")
+            if conn is None:
+                continue
+            try:
+                alive = conn.connection.is_alive()
+            except Exception:
+                alive = False
+            if not alive:
+                logger.info("%s - 保留的连接已断开，将重新连接", host.name)
+                try:
+                    host.close_connection("netmiko")
+                except Exception as e:
+                    logger.debug("%s - 关闭失效连接失败: %s", host.name, e)
+    
+    @staticmethod
+    def _nornir_key(devices: List, defaults: Dict):
+        """生成与保留实例比较的键，设备字段不完整时返回None"""
+        try:
+            return tuple(map(_device_key, devices)), tuple(defaults.items())
+        except AttributeError:
+            return None
     
     def get_nornir(self):
         """获取 nornir 实例"""
@@ -109,9 +209,25 @@ class NornirManager(SingletonBase):
             raise RuntimeError("Nornir 尚未初始化")
         return self.nr
     
-    def close(self):
-        """关闭 nornir 连接"""
+    def close(self, keep_alive: bool = False):
+        """关闭 nornir 连接
+        
+        Args:
+            keep_alive: 保留连接供下一次相同设备的操作复用，空闲或存在过久后由定时器关闭
+        """
+        self._cancel_idle_timer()
+        if keep_alive:
+            if self.nr:
+                # 只在保留实例时按清单实际取值生成复用键
+                hosts = self.nr.inventory.hosts.values()
+                self._nr_key = tuple(map(_host_key, hosts)), tuple(self._nr_defaults.items())
+                self._nr_last_used = now = time.monotonic()
+                delay = max(0.0, min(_IDLE_TIMEOUT, self._nr_created + _MAX_AGE - now))
+                self._idle_timer = threading.Timer(delay, self._close_expired, args=(self.nr,))
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+            return
         if self.nr:
-            # 主机名编码已在数据层面处理，不需要在这里转换
             self.nr.close_connections()
-            self.nr = None 
\ No newline at end of file
+            self.nr = None
+            self._nr_key = None 
\ No newline at end of file
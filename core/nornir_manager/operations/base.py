@@ -1,10 +1,19 @@
 from typing import List, Dict, Any
+from functools import lru_cache
+from operator import attrgetter
 from PySide6.QtCore import QObject, Signal
 import logging
+import os
 from ..base.nornir_manager import NornirManager
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=256)
+def ensure_dir(path: str) -> str:
+    """创建目录并缓存，同一次运行中每个目录只创建一次"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
 class BaseOperation(QObject):
     """操作基类"""
     
@@ -13,6 +22,9 @@ class BaseOperation(QObject):
     progress_updated = Signal(int, int)  # (current, total)
     operation_finished = Signal(bool)  # success
     
+    # 设备必填字段，一次调用取出全部字段
+    _required_fields = attrgetter('name', 'hostname', 'username', 'password')
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.is_running = False
@@ -21,8 +33,10 @@ class BaseOperation(QObject):
         
     def _validate_device(self, device) -> bool:
         """验证设备数据是否完整"""
-        required_fields = ['name', 'hostname', 'username', 'password']
-        return all(hasattr(device, field) and getattr(device, field) for field in required_fields)
+        try:
+            return all(self._required_fields(device))
+        except AttributeError:
+            return False
         
     def stop(self):
         """停止操作"""
@@ -1,9 +1,13 @@
 from typing import List, Dict
+from operator import attrgetter
 import logging
 import os
+from functools import lru_cache
+from pathlib import Path
 from PySide6.QtCore import QObject, Signal
-from nornir_netmiko.tasks import netmiko_send_command, netmiko_send_config, netmiko_multiline
+from nornir_netmiko.tasks import netmiko_send_config, netmiko_multiline
 from ..base.nornir_manager import NornirManager
+from .base import ensure_dir
 from core.db.database import Database
 
 from nornir.core.task import Result
@@ -11,6 +15,26 @@ from PySide6.QtCore import QUrl
 
 logger = logging.getLogger(__name__)
 
+# 设备必填字段，一次调用取出全部字段
+_required_fields = attrgetter('name', 'hostname', 'username', 'password')
+
+# 输出文件中每条命令之间的分隔线
+_SEP = "-" * 50 + "\n"
+
+# 命令模式显示名称
+_MODE_DISPLAY = {
+    "configuration": "配置命令",
+    "multiline": "交互命令",
+    "netmiko_send_command": "视图命令"
+}
+
+
+@lru_cache(maxsize=4096)
+def _file_href(path: str) -> str:
+    """本地文件路径转为链接地址，结果缓存供概览重复使用"""
+    return QUrl.fromLocalFile(path).toString()
+
+
 class CommandSender(QObject):
     """命令发送操作类"""
     
@@ -43,38 +67,32 @@ class CommandSender(QObject):
                 failed=True
             )
         
+        emit_status = self.status_changed.emit
         try:
             device = task.host
             device_name = device.name
             site = device.data.get('site', "未分类")
             
-            logger.info(f"开始执行命令 - 设备: {device_name}, 站点: {site}")
-            logger.info(f"命令模式: {mode}")
-            logger.info(f"使用timing模式: {use_timing}")
-            logger.info(f"执行命令: \n{command}")
+            logger.info("开始执行命令 - 设备: %s, 站点: %s", device_name, site)
+            logger.info("命令模式: %s", mode)
+            logger.info("使用timing模式: %s", use_timing)
+            logger.debug("执行命令: \n%s", command)
 
             # 更新状态为正在执行
-            self.status_changed.emit(device_name, "正在执行命令...")
+            emit_status(device_name, "正在执行命令...")
 
             # 创建站点输出目录
             site_path = os.path.join(self.output_path, site)
-            os.makedirs(site_path, exist_ok=True)
             
             # 根据命令模式创建子目录
-            mode_display = {
-                "configuration": "配置命令",
-                "multiline": "交互命令",
-                "netmiko_send_command": "视图命令"
-            }
-            mode_path = os.path.join(site_path, mode_display.get(mode, "其他命令"))
-            os.makedirs(mode_path, exist_ok=True)
+            mode_path = ensure_dir(os.path.join(site_path, _MODE_DISPLAY.get(mode, "其他命令")))
             
             output_file = os.path.join(mode_path, f'{device_name}-commands.txt')
             combined_output = []
 
             # 根据模式选择发送方法
             if mode == "configuration":
-                logger.info(f"{device_name} - 使用配置命令模式")
+                logger.info("%s - 使用配置命令模式", device_name)
                 # 分割命令并过滤空行
                 config_commands = [cmd.strip() for cmd in command.split('\n') if cmd.strip()]
                 output = task.run(
@@ -83,13 +101,11 @@ class CommandSender(QObject):
                     name=f"send_config_to_{device_name}"
                 )
                 # 写入命令和输出
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(f"配置命令执行:\n")
-                    f.write(f"命令列表:\n")
-                    for cmd in config_commands:
-                        f.write(f"  {cmd}\n")
-                    f.write("\n执行输出:\n")
-                    f.write(str(output.result))
+                parts = ["配置命令执行:\n命令列表:\n"]
+                parts.extend(f"  {cmd}\n" for cmd in config_commands)
+                parts.append("\n执行输出:\n")
+                parts.append(str(output.result))
+                Path(output_file).write_text("".join(parts), encoding='utf-8')
                 
                 combined_output = [
                     "配置命令执行结果:",
@@ -101,7 +117,7 @@ class CommandSender(QObject):
                 ]
                 
             elif mode == "multiline":
-                logger.info(f"{device_name} - 使用交互命令模式")
+                logger.info("%s - 使用交互命令模式", device_name)
                 command_list = []
                 
                 # 改进命令解析
@@ -120,7 +136,7 @@ class CommandSender(QObject):
                         expect = parts[1].strip() if len(parts) > 1 else r"[#>]"
                         command_list.append([cmd, expect])
                 
-                logger.debug(f"处理后的命令列表: {command_list}")
+                logger.debug("处理后的命令列表: %s", command_list)
                 
                 try:
                     # 根据timing模式决定如何传递命令
@@ -134,18 +150,16 @@ class CommandSender(QObject):
                     )
                     
                     # 改进输出文件格式
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        f.write("=== 交互命令执行 ===\n\n")
-                        f.write("执行的命令序列:\n")
-                        for i, cmd in enumerate(command_list, 1):
-                            f.write(f"{i}. 命令: {cmd}\n")
-                        f.write("\n=== 执行输出 ===\n")
-                        f.write(str(output.result))
+                    parts = ["=== 交互命令执行 ===\n\n执行的命令序列:\n"]
+                    parts.extend(f"{i}. 命令: {cmd}\n" for i, cmd in enumerate(command_list, 1))
+                    parts.append("\n=== 执行输出 ===\n")
+                    parts.append(str(output.result))
+                    Path(output_file).write_text("".join(parts), encoding='utf-8')
                     
                     # 优化结果显示
                     combined_output = [
                         "交互命令执行结果:",
-                        f"输出文件: <a href='{QUrl.fromLocalFile(output_file).toString()}'>{os.path.basename(output_file)}</a>",
+                        f"输出文件: <a href='{_file_href(output_file)}'>{os.path.basename(output_file)}</a>",
                         "\n执行的命令序列:"
                     ]
                     for i, cmd in enumerate(command_list, 1):
@@ -159,36 +173,27 @@ class CommandSender(QObject):
                     
                 except Exception as e:
                     error_msg = f"交互命令执行失败: {str(e)}"
-                    logger.error(f"{device_name} - {error_msg}")
+                    logger.error("%s - %s", device_name, error_msg)
                     raise Exception(error_msg)
                 
             else:  # netmiko_send_command
-                logger.info(f"{device_name} - 使用视图命令模式")
+                logger.info("%s - 使用视图命令模式", device_name)
                 # 分割多行命令
                 commands = [cmd.strip() for cmd in command.split('\n') if cmd.strip()]
-                all_outputs = []
                 
-                # 逐条执行命令
-                for cmd in commands:
-                    output = task.run(
-                        task=netmiko_send_command,
-                        command_string=cmd,
-                        use_timing=use_timing,
-                        name=f"send_command_to_{device_name}"
-                    )
-                    all_outputs.append((cmd, str(output.result)))
+                # 在同一netmiko会话上逐条执行，省去每条命令一次的子任务开销
+                net_connect = device.get_connection("netmiko", task.nornir.config)
+                send = net_connect.send_command_timing if use_timing else net_connect.send_command
+                all_outputs = [(cmd, str(send(cmd))) for cmd in commands]
                 
                 # 写入命令和输出
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(f"视图命令执行:\n")
-                    for cmd, out in all_outputs:
-                        f.write(f"\n命令:\n{cmd}\n")
-                        f.write(f"输出:\n{out}\n")
-                        f.write("-" * 50 + "\n")
+                parts = ["视图命令执行:\n"]
+                parts.extend(f"\n命令:\n{cmd}\n输出:\n{out}\n{_SEP}" for cmd, out in all_outputs)
+                Path(output_file).write_text("".join(parts), encoding='utf-8')
                 
                 combined_output = [
                     "视图命令执行结果:",
-                    f"输出文件: <a href='{QUrl.fromLocalFile(output_file).toString()}'>{os.path.basename(output_file)}</a>",
+                    f"输出文件: <a href='{_file_href(output_file)}'>{os.path.basename(output_file)}</a>",
                     "",
                     "执行的命令:",
                     *[f"  {cmd}" for cmd, _ in all_outputs],
@@ -209,8 +214,8 @@ class CommandSender(QObject):
             
         except Exception as e:
             error_msg = f"命令执行失败: {str(e)}"
-            logger.error(f"{device_name} - {error_msg}")
-            self.status_changed.emit(device_name, f"失败: {str(e)}")
+            logger.error("%s - %s", device_name, error_msg)
+            emit_status(device_name, f"失败: {str(e)}")
             return Result(
                 host=task.host,
                 result=(False, error_msg, None)
@@ -218,8 +223,10 @@ class CommandSender(QObject):
             
     def _validate_device(self, device) -> bool:
         """验证设备数据是否完整"""
-        required_fields = ['name', 'hostname', 'username', 'password']
-        return all(hasattr(device, field) and getattr(device, field) for field in required_fields)
+        try:
+            return all(_required_fields(device))
+        except AttributeError:
+            return False
     
     def stop_command(self):
         """停止命令执行"""
@@ -228,8 +235,13 @@ class CommandSender(QObject):
             if self.nornir_mgr:
                 self.nornir_mgr.close()
             
-    def start_command(self, devices: List, command: str, mode: str, use_timing: bool = False):
-        """开始执行命令"""
+    def start_command(self, devices: List, command: str, mode: str, use_timing: bool = False,
+                      keep_alive: bool = False):
+        """开始执行命令
+        
+        Args:
+            keep_alive: 完成后保留连接供下一次相同设备的操作复用，由之后的操作或程序退出时关闭
+        """
         if self.is_running:
             logger.warning("命令执行器已在运行中")
             return
@@ -241,12 +253,13 @@ class CommandSender(QObject):
             
         self.is_running = True
         self.results = {}  # 重置结果
+        ensure_dir.cache_clear()  # 每次执行重新检查输出目录是否存在
         total = len(devices)
         completed = 0
-        logger.info(f"开始在 {total} 个设备上执行命令")
-        logger.info(f"命令: {command}")
-        logger.info(f"模式: {mode}")
-        logger.info(f"使用timing模式: {use_timing}")
+        logger.info("开始在 %s 个设备上执行命令", total)
+        logger.info("命令: %s", command)
+        logger.info("模式: %s", mode)
+        logger.info("使用timing模式: %s", use_timing)
         
         try:
             # 验证设备数据
@@ -269,6 +282,8 @@ class CommandSender(QObject):
             
             # 处理结果
             all_completed = True
+            mode_display = _MODE_DISPLAY.get(mode, "命令")
+            emit_status = self.status_changed.emit
             for device_name, result in results.items():
                 if not self.is_running:
                     logger.info("命令执行被中止")
@@ -286,15 +301,10 @@ class CommandSender(QObject):
                         'result': str(result.exception),
                         'output_file': None
                     }
-                    self.status_changed.emit(device_name, error_msg)
+                    emit_status(device_name, error_msg)
                 else:
                     success, output, output_file = result[0].result
                     final_status = "成功: 命令已执行" if success else "失败: 命令执行出错"
-                    mode_display = {
-                        "configuration": "配置命令",
-                        "multiline": "交互命令",
-                        "netmiko_send_command": "视图命令"
-                    }.get(mode, "命令")
                     status_msg = f"成功: {mode_display}已执行" if success else final_status
                     
                     self.results[device_name] = {
@@ -302,7 +312,7 @@ class CommandSender(QObject):
                         'result': output,
                         'output_file': output_file
                     }
-                    self.status_changed.emit(device_name, status_msg)
+                    emit_status(device_name, status_msg)
                 
                 # 移除原来的状态更新信号发送
                 # self.status_changed.emit(device_name, self.results[device_name]['status'])  # 注释掉这行
@@ -315,13 +325,13 @@ class CommandSender(QObject):
             
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"执行命令时发生错误: {error_msg}")
+            logger.error("执行命令时发生错误: %s", error_msg)
             logger.exception("详细错误信息:")
             self.operation_finished.emit(False)
             
         finally:
             self.is_running = False
-            self.nornir_mgr.close()  # 确保关闭连接
+            self.nornir_mgr.close(keep_alive)  # 未要求保留时关闭连接
             logger.info("命令执行操作结束")
     
     def get_results(self) -> dict:
@@ -348,7 +358,7 @@ class CommandSender(QObject):
             
         # 如果有输出文件，添加文件链接
         if output_file:
-            file_url = QUrl.fromLocalFile(output_file).toString()
+            file_url = _file_href(output_file)
             content.append(f"文件: <a href='{file_url}'>{os.path.basename(output_file)}</a>")
             
         content.append("<hr>")
@@ -1,27 +1,78 @@
 from typing import List
+import atexit
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 import logging
 from datetime import datetime
+from pathlib import Path
 from nornir.core.task import Task, Result
 from nornir_netmiko.tasks import netmiko_send_command
+from netmiko.exceptions import NetmikoTimeoutException
+from paramiko.ssh_exception import AuthenticationException
 from core.db.database import Database
 
 from core.utils.logger import log_operation, handle_error
-from .base import BaseOperation
+from .base import BaseOperation, ensure_dir
 
 logger = logging.getLogger(__name__)
 
+# 异常类型 -> 提示信息，按顺序匹配
+_ERROR_MESSAGES = (
+    (NetmikoTimeoutException, "设备不可达，请检查: 1.IP地址是否正确 2.端口是否正确 3.是否有防火墙限制"),
+    (AuthenticationException, "认证失败，请检查用户名和密码"),
+)
+
+
+def _error_message(error) -> str:
+    """将备份异常转换为用户可读的提示信息"""
+    for error_type, message in _ERROR_MESSAGES:
+        if isinstance(error, error_type):
+            return message
+    if "Connection closed" in str(error):
+        return "连接异常断开，请检查网络连接"
+    return str(error)
+
+
+# 后台写配置文件的线程池，Nornir工作线程拿到配置后即可处理下一台设备
+_write_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cfg-writer")
+atexit.register(_write_pool.shutdown)
+
+# 超过该长度的配置一次编码后直接写文件描述符，不经过文本层和缓冲层
+_RAW_WRITE_THRESHOLD = 1 << 20
+_RAW_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def _write_backup(backup_file: str, content: str) -> None:
+    """写入配置备份文件"""
+    if len(content) < _RAW_WRITE_THRESHOLD:
+        Path(backup_file).write_text(content, encoding='utf-8')
+        return
+
+    # 与文本模式保持一致的换行转换
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(backup_file, _RAW_WRITE_FLAGS, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
 class ConfigBackup(BaseOperation):
     """配置备份操作类"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db = Database()
+        self._backup_day = None  # 本次备份的日期目录名，start()时确定
+        self._pending_writes = []  # 后台写文件任务
 
         # 使用统一的路径获取方法
         from core.config.path_utils import get_archive_base_path, get_archive_subdir_path
         self.base_path = get_archive_base_path(self.db)
         self.backup_path = get_archive_subdir_path("备份", self.db)
+        self._backup_root = Path(self.backup_path)
     
     def backup_config(self, task: Task) -> Result:
         """备份单个设备的配置"""
@@ -35,15 +86,16 @@ class ConfigBackup(BaseOperation):
         device = task.host
         device_name = device.name
         site = device.data.get('site', "未分类")
+        emit_status = self.status_changed.emit
         
-        logger.info(f"{device_name} - 开始备份配置，站点: {site}")
+        logger.info("%s - 开始备份配置，站点: %s", device_name, site)
         
         try:
             # 更新状态为正在备份
-            self.status_changed.emit(device_name, "正在备份...")
+            emit_status(device_name, "正在备份...")
             
             # 执行备份命令
-            logger.debug(f"{device_name} - 执行配置备份命令")
+            logger.debug("%s - 执行配置备份命令", device_name)
             result = task.run(
                 task=netmiko_send_command,
                 command_string="display current-configuration"
@@ -52,19 +104,10 @@ class ConfigBackup(BaseOperation):
             # 检查任务结果
             if result.failed:
                 # 从结果中提取原始异常
-                error = result[0].exception
-                error_msg = str(error)
-                
-                if isinstance(error, Exception):
-                    if "NetmikoTimeoutException" in str(type(error)):
-                        error_msg = "设备不可达，请检查: 1.IP地址是否正确 2.端口是否正确 3.是否有防火墙限制"
-                    elif "AuthenticationException" in str(type(error)):
-                        error_msg = "认证失败，请检查用户名和密码"
-                    elif "socket.error" in str(type(error)) or "Connection closed" in str(error):
-                        error_msg = "连接异常断开，请检查网络连接"
+                error_msg = _error_message(result[0].exception)
                 
                 status = f"失败: {error_msg}"
-                self.status_changed.emit(device_name, status)
+                emit_status(device_name, status)
                 self.results[device_name] = {
                     'status': status,
                     'result': error_msg,
@@ -77,26 +120,19 @@ class ConfigBackup(BaseOperation):
                 )
             
             # 创建备份目录
-            timestamp = datetime.now().strftime("%Y%m%d")
-            backup_dir = os.path.normpath(os.path.join(self.base_path, "备份", site, timestamp))
-            os.makedirs(backup_dir, exist_ok=True)
+            day = self._backup_day or datetime.now().strftime("%Y%m%d")
+            backup_dir = ensure_dir(str(self._backup_root / site / day))
             
             # 保存配置文件
-            timestamp = datetime.now().strftime("%H%M%S")
+            now = datetime.now()
+            timestamp = f"{now.hour:02d}{now.minute:02d}{now.second:02d}"
             file_name = f"{device_name}_{device.hostname}_{timestamp}.txt"
-            backup_file = os.path.normpath(os.path.join(backup_dir, file_name))
+            backup_file = os.path.join(backup_dir, file_name)
             
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                f.write(result[0].result)
-            
-            status = "成功: 配置已备份"
-            logger.info(f"{device_name} - 配置已备份到: {backup_file}")
-            self.status_changed.emit(device_name, status)
-            self.results[device_name] = {
-                'status': status,
-                'result': f"配置已备份到: {backup_file}",
-                'output_file': backup_file
-            }
+            # 文件写完后才更新为成功状态
+            self._pending_writes.append(
+                _write_pool.submit(self._save_backup, device_name, backup_file, result[0].result)
+            )
             
             return Result(
                 host=device,
@@ -104,16 +140,10 @@ class ConfigBackup(BaseOperation):
             )
             
         except Exception as e:
-            error_msg = str(e)
-            if "NetmikoTimeoutException" in str(type(e)):
-                error_msg = "设备不可达，请检查: 1.IP地址是否正确 2.端口是否正确 3.是否有防火墙限制"
-            elif "AuthenticationException" in str(type(e)):
-                error_msg = "认证失败，请检查用户名和密码"
-            elif "socket.error" in str(type(e)) or "Connection closed" in str(e):
-                error_msg = "连接异常断开，请检查网络连接"
+            error_msg = _error_message(e)
             
             status = f"失败: {error_msg}"
-            self.status_changed.emit(device_name, status)
+            emit_status(device_name, status)
             self.results[device_name] = {
                 'status': status,
                 'result': error_msg,
@@ -126,11 +156,49 @@ class ConfigBackup(BaseOperation):
                 failed=True
             )
     
+    def _save_backup(self, device_name: str, backup_file: str, content: str) -> None:
+        """在后台线程写入备份文件，并根据写入结果更新设备状态"""
+        try:
+            _write_backup(backup_file, content)
+        except Exception as e:
+            error_msg = f"保存配置文件失败: {e}"
+            logger.error("%s - %s", device_name, error_msg)
+            status = f"失败: {error_msg}"
+            self.status_changed.emit(device_name, status)
+            self.results[device_name] = {
+                'status': status,
+                'result': error_msg,
+                'output_file': None
+            }
+            return
+        
+        status = "成功: 配置已备份"
+        logger.info("%s - 配置已备份到: %s", device_name, backup_file)
+        self.status_changed.emit(device_name, status)
+        self.results[device_name] = {
+            'status': status,
+            'result': f"配置已备份到: {backup_file}",
+            'output_file': backup_file
+        }
+    
+    def _wait_pending_writes(self) -> None:
+        """等待后台写文件及状态更新全部完成"""
+        wait(self._pending_writes)
+        self._pending_writes.clear()
+    
     @log_operation("配置备份")
-    def start(self, devices: List[str]) -> None:
-        """开始备份配置"""
+    def start(self, devices: List[str], keep_alive: bool = False) -> None:
+        """开始备份配置
+        
+        Args:
+            devices: 设备列表
+            keep_alive: 完成后保留连接供下一次相同设备的操作复用，由之后的操作或程序退出时关闭
+        """
         self.is_running = True
         self.results.clear()
+        # 同一次备份的设备共用日期目录，并重新检查目录是否存在
+        self._backup_day = datetime.now().strftime("%Y%m%d")
+        ensure_dir.cache_clear()
         
         try:
             # 过滤无效设备
@@ -156,6 +224,7 @@ class ConfigBackup(BaseOperation):
             except Exception as e:
                 self.results = handle_error(logger, "全局", e, "配置备份")
         finally:
+            self._wait_pending_writes()
             self.is_running = False
-            self.nornir_mgr.close()
+            self.nornir_mgr.close(keep_alive)
             logger.info("备份操作完成") 
\ No newline at end of file
@@ -2,16 +2,36 @@ from typing import List
 import os
 import logging
 from datetime import datetime
-import difflib
 from nornir.core.task import Task, Result
 from nornir_netmiko.tasks import netmiko_send_command
 from core.db.database import Database
 
 from core.utils.logger import log_operation, handle_error
-from .base import BaseOperation
+from .base import BaseOperation, ensure_dir
+
+# 安装了 cdifflib 时使用其C实现的 SequenceMatcher，接口与 difflib 相同
+try:
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
 
 logger = logging.getLogger(__name__)
 
+
+def _diff_lines(saved_list: List[str], curr_list: List[str]) -> List[str]:
+    """逐行对比配置，返回带【删除-】/【新增+】标记的完整配置行"""
+    lines = []
+    matcher = SequenceMatcher(None, saved_list, curr_list)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            lines.extend(f'  {line}' for line in saved_list[i1:i2])
+        else:
+            # replace 先列出删除的行再列出新增的行，与 Differ 的输出顺序一致
+            lines.extend(f'【删除-】{line}' for line in saved_list[i1:i2])
+            lines.extend(f'【新增+】{line}' for line in curr_list[j1:j2])
+    return lines
+
+
 class ConfigDiff(BaseOperation):
     """配置对比操作类"""
     
@@ -64,52 +84,44 @@ class ConfigDiff(BaseOperation):
                 command_string=current_cmd
             )
             
-            # 对比配置
-            saved_list = saved_conf.result.splitlines(True)
-            curr_list = curr_conf.result.splitlines(True)
-            
-            differ = difflib.Differ()
-            diff = list(differ.compare(saved_list, curr_list))
+            # 对比配置，两份配置完全相同时无需逐行对比
+            diff = []
+            if saved_conf.result != curr_conf.result:
+                diff = _diff_lines(saved_conf.result.splitlines(True),
+                                   curr_conf.result.splitlines(True))
             
             # 检查是否有差异
-            has_diff = not all(line.startswith(' ') for line in diff)
+            has_diff = bool(diff)
             
             if has_diff:
-                # 创建站点目录
+                # 站点目录，随日期目录一并创建
                 site_path = os.path.normpath(os.path.join(self.diff_path, site))
-                os.makedirs(site_path, exist_ok=True)
                 
                 # 创建日期目录
                 date_str = datetime.now().strftime("%Y%m%d")
-                date_path = os.path.normpath(os.path.join(site_path, date_str))
-                os.makedirs(date_path, exist_ok=True)
-                
-                # 生成文本格式的差异输出
-                diff_content = []
-                diff_content.append('设备配置差异报告')
-                diff_content.append('=' * 50)
-                diff_content.append(f'设备名称: {device_name}')
-                diff_content.append(f'IP地址: {device.hostname}')
-                diff_content.append(f'站点: {site}')
-                diff_content.append(f'对比时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
-                diff_content.append('=' * 50)
-                diff_content.append('')
+                date_path = ensure_dir(os.path.normpath(os.path.join(site_path, date_str)))
                 
-                for line in diff:
-                    if line.startswith('-'):
-                        diff_content.append(f'【删除-】{line[2:]}')
-                    elif line.startswith('+'):
-                        diff_content.append(f'【新增+】{line[2:]}')
-                    elif not line.startswith('?'):  # 忽略 difflib 的提示行
-                        diff_content.append(f'  {line[2:]}')
+                # 生成报告头，对比结果行自带换行符
+                header = [
+                    '设备配置差异报告',
+                    '=' * 50,
+                    f'设备名称: {device_name}',
+                    f'IP地址: {device.hostname}',
+                    f'站点: {site}',
+                    f'对比时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
+                    '=' * 50,
+                    '',
+                ]
                 
                 # 保存差异文件
                 time_str = datetime.now().strftime("%H%M%S")
                 file_name = f"{device_name}_{device.hostname}_{time_str}.txt"
                 diff_file = os.path.normpath(os.path.join(date_path, file_name))
                 
-                with open(diff_file, 'w', encoding='utf-8') as f:
-                    f.write(''.join(diff_content))
+                # 大缓冲直接写入各行，不再拼接整份报告
+                with open(diff_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    f.write('\n'.join(header) + '\n')
+                    f.writelines(diff)
                 
                 # 生成相对路径用于显示
                 rel_path = os.path.relpath(diff_file, self.diff_path)
@@ -144,10 +156,16 @@ class ConfigDiff(BaseOperation):
             )
     
     @log_operation("配置对比")
-    def start(self, devices: List[str]) -> None:
-        """开始对比配置"""
+    def start(self, devices: List[str], keep_alive: bool = False) -> None:
+        """开始对比配置
+        
+        Args:
+            devices: 设备列表
+            keep_alive: 完成后保留连接供下一次相同设备的操作复用，由之后的操作或程序退出时关闭
+        """
         self.is_running = True
         self.results.clear()
+        ensure_dir.cache_clear()  # 每次对比重新检查输出目录是否存在
         
         try:
             # 过滤无效设备
@@ -174,5 +192,5 @@ class ConfigDiff(BaseOperation):
                 self.results = handle_error(logger, "全局", e, "配置对比")
         finally:
             self.is_running = False
-            self.nornir_mgr.close()
+            self.nornir_mgr.close(keep_alive)
             logger.info("对比操作完成") 
\ No newline at end of file
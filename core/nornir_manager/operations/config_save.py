@@ -55,8 +55,13 @@ class ConfigSave(BaseOperation):
             )
     
     @log_operation("配置保存")
-    def start(self, devices: List[str]) -> None:
-        """开始保存配置"""
+    def start(self, devices: List[str], keep_alive: bool = False) -> None:
+        """开始保存配置
+        
+        Args:
+            devices: 设备列表
+            keep_alive: 完成后保留连接供下一次相同设备的操作复用，由之后的操作或程序退出时关闭
+        """
         self.is_running = True
         self.results.clear()
         
@@ -85,5 +90,5 @@ class ConfigSave(BaseOperation):
                 self.results = handle_error(logger, "全局", e, "配置保存")
         finally:
             self.is_running = False
-            self.nornir_mgr.close()
+            self.nornir_mgr.close(keep_alive)
             logger.info("保存操作完成")
\ No newline at end of file
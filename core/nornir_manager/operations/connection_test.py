@@ -23,6 +23,7 @@ class ConnectionTest(BaseOperation):
 
         device = task.host
         device_name = device.name
+        port = device.port or 22  # SSH端口
         logger.info(f"开始测试设备: {device_name}")
         
         # 1. 使用tcp_ping测试端口连通性
@@ -30,11 +31,11 @@ class ConnectionTest(BaseOperation):
         logger.info(f"{device_name} - 测试端口连通性...")
         result = task.run(
             task=tcp_ping,
-            ports=[device.port or 22],  # SSH端口
+            ports=[port],
             timeout=5
         )
         
-        if not result[0].result[device.port or 22]:
+        if not result[0].result[port]:
             status = "失败：端口不可达"
             logger.error(f"{device_name} - {status}")
             self.status_changed.emit(device_name, status)
@@ -60,6 +61,12 @@ class ConnectionTest(BaseOperation):
         try:
             # 尝试建立 SSH 连接
             logger.info(f"{device_name} - 尝试建立 SSH 连接...")
+            # 丢弃其他操作保留的会话，确保每次都重新登录
+            if "netmiko" in device.connections:
+                try:
+                    device.close_connection("netmiko")
+                except Exception as e:
+                    logger.debug(f"{device_name} - 关闭保留的连接失败: {e}")
             conn = device.get_connection("netmiko", task.nornir.config)
             # 如果没有抛出异常，说明连接成功
             status = "成功: 登录测试完成"
@@ -85,11 +92,6 @@ class ConnectionTest(BaseOperation):
             }
             raise
     
-    def _validate_device(self, device) -> bool:
-        """验证设备数据是否完整"""
-        required_fields = ['name', 'hostname', 'username', 'password']
-        return all(hasattr(device, field) and getattr(device, field) for field in required_fields)
-    
     @log_operation("连接测试")
     def start(self, devices: List):
         """开始连接测试"""
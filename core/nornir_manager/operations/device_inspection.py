@@ -1,4 +1,5 @@
 from typing import List, Dict, Any, Optional
+from operator import attrgetter
 import logging
 import os
 from PySide6.QtCore import QObject, Signal
@@ -12,6 +13,9 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# 巡检需要按平台选择命令，必填字段包含platform
+_required_attrs = attrgetter('name', 'hostname', 'platform', 'username', 'password')
+
 class DeviceInspection(QObject):
     """设备巡检操作类"""
 
@@ -38,8 +42,10 @@ class DeviceInspection(QObject):
 
     def _validate_device(self, device):
         """验证设备数据是否完整"""
-        required_attrs = ['name', 'hostname', 'platform', 'username', 'password']
-        return all(hasattr(device, attr) and getattr(device, attr) for attr in required_attrs)
+        try:
+            return all(_required_attrs(device))
+        except AttributeError:
+            return False
 
     def get_inspection_commands(self, platform: str) -> List[str]:
         """根据平台类型获取巡检命令"""
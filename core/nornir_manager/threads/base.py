@@ -7,6 +7,7 @@ import logging
 class BaseOperationThread(QThread):
     """基础操作线程类"""
     finished = Signal(dict, datetime)  # 发送结果和开始时间
+    keep_alive = False  # 完成后保留连接供紧接着对同一批设备的操作复用，由调用方按需开启
     
     def __init__(self, operation_instance: Any, parent: Optional[QThread] = None):
         super().__init__(parent)
@@ -43,7 +44,10 @@ class BaseOperationThread(QThread):
         """执行具体操作，子类可以重写此方法"""
         logging.info("执行操作")
         if hasattr(self.operation, 'start'):
-            self.operation.start(self.devices)
+            if self.keep_alive:
+                self.operation.start(self.devices, keep_alive=True)
+            else:
+                self.operation.start(self.devices)
             logging.info("操作已启动")
         else:
             logging.warning("操作实例没有 start 方法")
@@ -99,4 +103,5 @@ class BaseCommandThread(BaseOperationThread):
     def _execute_operation(self) -> None:
         """执行命令操作"""
         if self.devices and self.command:
-            self.operation.start_command(self.devices, self.command, self.mode, self.use_timing) 
\ No newline at end of file
+            self.operation.start_command(self.devices, self.command, self.mode, self.use_timing,
+                                         keep_alive=self.keep_alive) 
\ No newline at end of file
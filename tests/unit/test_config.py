@@ -8,6 +8,7 @@ import configparser
 from unittest.mock import MagicMock, patch, mock_open
 from pathlib import Path
 from core.config.user_config import UserConfigManager
+from core.config import path_utils
 
 @pytest.mark.unit
 class TestUserConfigManager:
@@ -308,3 +309,37 @@ class TestUserConfigManager:
             # 验证值已删除
             value = config_manager.get_config_value('test_section', 'test_key')
             assert value is None
+
+
+@pytest.mark.unit
+class TestArchiveBasePathCache:
+    """存档基础路径缓存测试类"""
+
+    def setup_method(self):
+        """每个测试方法前清除缓存"""
+        path_utils.invalidate_base_path_cache()
+
+    def test_base_path_cached_until_invalidated(self):
+        """测试存档路径只读取一次，清除缓存后重新读取"""
+        db = MagicMock()
+        config_manager = db.get_config_manager.return_value
+        config_manager.get_archive_base_path.return_value = '/archive/a'
+
+        assert path_utils.get_archive_base_path(db) == '/archive/a'
+        config_manager.get_archive_base_path.return_value = '/archive/b'
+        assert path_utils.get_archive_base_path(db) == '/archive/a'
+        assert config_manager.get_archive_base_path.call_count == 1
+
+        path_utils.invalidate_base_path_cache()
+        assert path_utils.get_archive_base_path(db) == '/archive/b'
+
+    def test_failure_not_cached(self):
+        """测试读取失败时返回默认路径且不缓存"""
+        db = MagicMock()
+        config_manager = db.get_config_manager.return_value
+        config_manager.get_archive_base_path.side_effect = OSError("boom")
+
+        assert path_utils.get_archive_base_path(db) == str(Path.home() / "nornir-gui-files")
+        config_manager.get_archive_base_path.side_effect = None
+        config_manager.get_archive_base_path.return_value = '/archive/a'
+        assert path_utils.get_archive_base_path(db) == '/archive/a'
@@ -0,0 +1,35 @@
+"""
+配置对比单元测试
+"""
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from core.nornir_manager.operations.config_diff import _diff_lines
+
+
+@pytest.mark.unit
+class TestDiffLines:
+    """配置逐行对比测试类"""
+
+    def test_identical_configs(self):
+        """测试配置一致时只有不带标记的行"""
+        lines = ["sysname R1\n", "interface GE0/0/1\n"]
+        assert _diff_lines(lines, list(lines)) == ["  sysname R1\n", "  interface GE0/0/1\n"]
+
+    def test_added_removed_and_changed_lines(self):
+        """测试新增、删除和修改的行带对应标记，并保留上下文行"""
+        saved = ["sysname R1\n", "ntp server 1.1.1.1\n", "interface GE0/0/1\n", " shutdown\n"]
+        curr = ["sysname R2\n", "interface GE0/0/1\n", " shutdown\n", "return\n"]
+
+        assert _diff_lines(saved, curr) == [
+            "【删除-】sysname R1\n",
+            "【删除-】ntp server 1.1.1.1\n",
+            "【新增+】sysname R2\n",
+            "  interface GE0/0/1\n",
+            "   shutdown\n",
+            "【新增+】return\n",
+        ]
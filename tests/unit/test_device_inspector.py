@@ -0,0 +1,161 @@
+"""
+设备巡检解析单元测试
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from core.device_inspector.base import split_sections
+from core.device_inspector.h3c import H3CInspector
+from core.device_inspector import huawei
+from core.device_inspector.huawei import HuaweiInspector
+
+
+def _section(cmd: str, output: str) -> str:
+    """按 device_inspection 的格式拼接单条命令输出"""
+    return f"命令:\n{cmd}\n输出:\n{output}\n" + "-" * 50 + "\n"
+
+
+@pytest.mark.unit
+class TestH3CInspector:
+    """H3C巡检解析测试类"""
+
+    def setup_method(self):
+        """每个测试方法前创建解析器"""
+        self.inspector = H3CInspector()
+
+    def test_fan_new_format(self):
+        """测试新格式风扇输出"""
+        content = _section("display fan", "Fan 1: \n State    : Normal\nFan 2: \n State    : Absent")
+        result = self.inspector.fan_inspect(content)
+
+        assert result["status"] == "abnormal"
+        assert result["details"] == {"Fan 2": "Absent"}
+
+    def test_fan_old_format_fallback(self):
+        """测试新格式无匹配时回退到旧格式"""
+        output = (
+            " Fan Frame 1   State: Normal\n"
+            " Fan Frame 2   State: Fault"
+        )
+        result = self.inspector.fan_inspect(_section("display fan", output))
+
+        assert result["status"] == "abnormal"
+        assert result["details"] == {"Fan Frame 2": "Fault"}
+
+    def test_fan_all_normal(self):
+        """测试风扇全部正常"""
+        content = _section("display fan", "Fan 1: \n State    : Normal")
+        assert self.inspector.fan_inspect(content) == {"status": "normal", "message": "风扇状态:正常"}
+
+    def test_int_error_inbound_and_outbound(self):
+        """测试入方向和出方向错包合并到同一接口"""
+        header = "Interface         Total(pkts)   Broadcast(pkts)   Multicast(pkts)  Err (pkts)\n"
+        inbound = header + "GE1/0/1           100           0                 0                3\nGE1/0/2           100           0                 0                0"
+        outbound = header + "GE1/0/1           100           0                 0                2"
+        content = (_section("display counters inbound interface", inbound)
+                   + _section("display counters outbound interface", outbound))
+        result = self.inspector.int_error_inspect(content)
+
+        assert result["status"] == "abnormal"
+        assert result["details"] == {"接口:GE1/0/1": "入方向错包数:3, 出方向错包数:2"}
+
+    def test_int_error_hyphenated_interface(self):
+        """测试接口名包含连字符时仍统计错包"""
+        header = "Interface         Total(pkts)   Broadcast(pkts)   Multicast(pkts)  Err (pkts)\n"
+        rows = "-" * 70 + "\nBridge-Aggregation1  100       0                 0                7"
+        content = _section("display counters inbound interface", header + rows)
+        result = self.inspector.int_error_inspect(content)
+
+        assert result["details"] == {"接口:Bridge-Aggregation1": "入方向错包数:7"}
+
+    def test_alarm_table_dash_leading_rows(self):
+        """测试以'-'开头的告警行不被当作分隔线"""
+        ruler = "-" * 40
+        output = (f"{ruler}\nIndex  Slot  Description\nLevel  Date\n{ruler}\n"
+                  f"-      1     port state changed\n-      2     port state changed\n{ruler}")
+        result = self.inspector.alarm_inspect(_section("display alarm", output))
+
+        assert result["status"] == "abnormal"
+        assert result["details"].count("port state changed") == 2
+
+    def test_alarm_dash_leading_lines_are_not_rulers(self):
+        """测试没有整行分隔线的输出不按告警表格处理"""
+        output = "- Index  Slot\nDescription\nLevel  Date\n1  port state changed\n- 2  port state changed"
+        assert self.inspector.alarm_inspect(_section("display alarm", output)) == {
+            "status": "normal", "message": "无活动告警"}
+
+
+    def test_inspect_all_scans_own_sections(self):
+        """测试inspect_all只把对应命令的输出交给各检测项"""
+        cpu_output = ("Slot 1 CPU 0 CPU usage:\n 5% in last 5 seconds\n"
+                      " 5% in last 1 minute\n 5% in last 5 minutes")
+        # 日志中出现的CPU行不属于display cpu输出，不应被当作CPU使用率
+        log_output = ("Slot 1 CPU 1 CPU usage:\n 95% in last 5 seconds\n"
+                      " 95% in last 1 minute\n 95% in last 5 minutes")
+        content = _section("display cpu", cpu_output) + _section("display logbuffer", log_output)
+
+        assert split_sections(content)[1][0] == "display logbuffer"
+        assert self.inspector.inspect_all(content)["cpu"] == {"status": "normal", "message": "CPU状态:正常"}
+
+@pytest.mark.unit
+class TestHuaweiInspector:
+    """华为巡检解析测试类"""
+
+    def setup_method(self):
+        """每个测试方法前创建解析器"""
+        self.inspector = HuaweiInspector()
+
+    def test_empty_alarm_section_does_not_leak(self):
+        """测试空告警输出不会读到下一条命令的输出"""
+        content = (_section("display alarm active", "")
+                   + _section("display logbuffer", "Error: link down Alarm"))
+        assert self.inspector.alarm_inspect(content) == {"status": "normal", "message": "无活动告警"}
+
+    def test_power_and_fan_multi_digit_ids(self):
+        """测试两位数编号的电源和风扇模块"""
+        output = ("PWR1   -   PWR   Present  PowerOn  Registered  Normal  NA\n"
+                  "PWR10  -   PWR   Present  PowerOn  Registered  Abnormal  NA\n"
+                  "FAN12  -   FAN   Present  PowerOn  Registered  Abnormal  NA")
+        content = _section("display device", output)
+
+        assert self.inspector.power_inspect(content)["details"] == {"PWR10": "Abnormal"}
+        assert self.inspector.fan_inspect(content)["details"] == {"FAN12": "Abnormal"}
+
+    def test_inspect_all_scans_power_and_fan_once(self):
+        """测试inspect_all中电源和风扇检测共用一次display device扫描"""
+        output = ("PWR1   -   PWR   Present  PowerOn  Registered  Abnormal  NA\n"
+                  "FAN1   -   FAN   Present  PowerOn  Registered  Normal  NA")
+        pattern = MagicMock(wraps=huawei._PWR_FAN_RE)
+        with patch.object(huawei, "_PWR_FAN_RE", pattern):
+            results = self.inspector.inspect_all(_section("display device", output))
+
+        assert pattern.findall.call_count == 1
+        assert results["power"]["details"] == {"PWR1": "Abnormal"}
+        assert results["fan"] == {"status": "normal", "message": "风扇状态:正常"}
+
+    def test_int_error_columns(self):
+        """测试按列解析接口错包，跳过表头、无错包行和NULL接口"""
+        output = ("Interface                   PHY   Protocol  InUti OutUti   inErrors  outErrors\n"
+                  "Eth-Trunk3                  up    up        0.01%  0.02%          0          0\n"
+                  "  XGigabitEthernet0/0/1     up    up        0.17%  0.62%          6          0\n"
+                  "10GE2/0/2                   down  down         0%     0%         20          3\n"
+                  "NULL0                       up    up(s)        0%     0%          1          0")
+        result = self.inspector.int_error_inspect(_section("display interface brief", output))
+
+        assert result["details"] == {
+            "接口:XGigabitEthernet0/0/1": "入错包:6",
+            "接口:10GE2/0/2": "入错包:20, 出错包:3",
+        }
+
+    def test_inspect_all_scans_own_sections(self):
+        """测试inspect_all只把对应命令的输出交给各检测项"""
+        # 排在前面的其他命令输出中出现CPU使用率，不应被当作display cpu的结果
+        content = (_section("display logbuffer", "CPU Usage  : 95% Max: 99%")
+                   + _section("display cpu", "CPU Usage  : 10% Max: 20%"))
+
+        assert self.inspector.inspect_all(content)["cpu"] == {"status": "normal", "message": "CPU状态:正常"}
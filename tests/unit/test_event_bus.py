@@ -19,19 +19,22 @@ from core.event_bus import EventBus
 class TestEventBus:
     """事件总线测试类"""
     
-    def setup_method(self):
-        """每个测试方法前重置事件总线"""
-        # 重置单例
-        EventBus._instance = None
-    
-    def test_event_bus_singleton(self):
-        """测试事件总线单例模式"""
-        # 创建两个事件总线实例
-        bus1 = EventBus()
-        bus2 = EventBus()
-        
-        # 验证它们是同一个实例
-        assert bus1 is bus2
+    def test_new_instance_is_independent(self):
+        """测试EventBus()创建新实例，其信号不会发送到模块级实例的槽"""
+        from core.event_bus import event_bus as global_bus
+        bus = EventBus()
+        
+        # 验证不再是单例
+        assert bus is not global_bus
+        
+        # 连接到模块级实例的回调不应收到新实例的信号
+        callback = MagicMock()
+        global_bus.device_list_changed.connect(callback)
+        try:
+            bus.device_list_changed.emit()
+            callback.assert_not_called()
+        finally:
+            global_bus.device_list_changed.disconnect(callback)
     
     def test_device_list_changed_signal(self):
         """测试设备列表变化信号"""
@@ -180,8 +183,4 @@ class TestEventBus:
         from core.event_bus import event_bus
         
         # 验证全局实例是EventBus类型
-        assert isinstance(event_bus, EventBus)
-        
-        # 验证全局实例与创建的实例是同一个
-        new_instance = EventBus()
-        assert event_bus is new_instance
\ No newline at end of file
+        assert isinstance(event_bus, EventBus)
\ No newline at end of file
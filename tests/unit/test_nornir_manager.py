@@ -0,0 +1,54 @@
+"""
+Nornir管理器单元测试
+"""
+import pytest
+import time
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from core.nornir_manager.base import nornir_manager as nm
+
+
+@pytest.mark.unit
+class TestKeepAlive:
+    """保留连接到期关闭测试类"""
+
+    def setup_method(self):
+        """每个测试方法前创建不连接数据库的管理器和假的nornir实例"""
+        nm.NornirManager.reset_instance()
+        with patch.object(nm, "Database"):
+            self.mgr = nm.NornirManager()
+        self.mgr._get_defaults = lambda: {"num_workers": None}
+        self.nr = MagicMock()
+        self.nr.inventory.hosts = {}
+        self.mgr.nr = self.nr
+        self.mgr._nr_defaults = {"num_workers": None}
+        self.mgr._nr_created = time.monotonic()
+
+    def teardown_method(self):
+        """清理定时器和单例"""
+        self.mgr._cancel_idle_timer()
+        nm.NornirManager.reset_instance()
+
+    def test_idle_connections_closed_by_timer(self):
+        """测试保留的连接空闲超时后自动关闭"""
+        with patch.object(nm, "_IDLE_TIMEOUT", 0.05):
+            self.mgr.close(keep_alive=True)
+            time.sleep(0.3)
+
+        self.nr.close_connections.assert_called_once()
+        assert self.mgr.nr is None
+
+    def test_reuse_cancels_timer(self):
+        """测试复用保留的连接后定时器不再关闭连接"""
+        with patch.object(nm, "_IDLE_TIMEOUT", 0.05):
+            self.mgr.close(keep_alive=True)
+            assert self.mgr.init_nornir([]) is self.nr
+            time.sleep(0.3)
+
+        self.nr.close_connections.assert_not_called()
+        assert self.mgr._idle_timer is None
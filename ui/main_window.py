@@ -6,6 +6,7 @@ from .pages.device_inspection_page import DeviceInspectionPage
 from core.db.database import Database
 from core.proxy_manager import ProxyManager
 from core.event_bus import event_bus
+from core.nornir_manager.base.nornir_manager import NornirManager
 
 class MainWindow(QMainWindow):
     """主窗口"""
@@ -51,6 +52,11 @@ class MainWindow(QMainWindow):
         """初始化代理设置"""
         self.proxy_manager.apply_proxy()
         
+    def closeEvent(self, event):
+        """窗口关闭时断开操作保留的设备连接"""
+        NornirManager().close()
+        super().closeEvent(event)
+        
     def on_settings_changed(self):
         """设置变化时的处理"""
         self.proxy_manager.apply_proxy() 
\ No newline at end of file
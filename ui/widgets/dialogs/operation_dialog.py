@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QGroupBox, QButtonGroup, QRadioButton, QMessageBox,
-                             QInputDialog, QLineEdit)
+                             QInputDialog, QLineEdit, QCheckBox)
 from PySide6.QtCore import Qt
 from datetime import datetime
 from typing import List, Optional, Type, Dict, Any, Callable
@@ -25,6 +25,9 @@ from core.nornir_manager.operations.dnat_query import DnatQuery
 
 logger = logging.getLogger(__name__)
 
+# 支持完成后保持连接的操作线程
+_KEEP_ALIVE_THREADS = (BackupThread, DiffThread, SaveThread, CommandThread)
+
 class OperationDialog(QDialog):
     """设备操作对话框"""
 
@@ -121,6 +124,11 @@ class OperationDialog(QDialog):
         layout.addWidget(config_group)
         layout.addWidget(command_group)
 
+        # 保持连接选项，默认关闭，避免长时间占用设备的VTY线路
+        self.keep_alive_check = QCheckBox("完成后保持连接")
+        self.keep_alive_check.setToolTip("接下来要对同一批设备继续执行配置备份、对比、保存或命令时勾选，复用已登录的SSH连接")
+        layout.addWidget(self.keep_alive_check)
+
         # 添加按钮布局
         button_layout = QHBoxLayout()
 
@@ -213,6 +221,8 @@ class OperationDialog(QDialog):
             logging.info(f"获取到设备: {len(devices)}个")
             # 创建并设置线程
             self.current_thread = thread_class()
+            if thread_class in _KEEP_ALIVE_THREADS:
+                self.current_thread.keep_alive = self.keep_alive_check.isChecked()
 
             # 根据是否有额外参数调用setup
             if operation_name == "查询MAC-IP" and 'mac_or_ip' in kwargs:
@@ -257,6 +267,7 @@ class OperationDialog(QDialog):
             if command:
                 # 创建并设置命令线程
                 self.current_thread = CommandThread()
+                self.current_thread.keep_alive = self.keep_alive_check.isChecked()
                 self.current_thread.setup(devices, command, mode, use_timing, self.parent().update_device_status)
                 # 添加到线程管理器，使用统一的add_thread方法
                 self.parent().thread_manager.add_thread(